@@ -0,0 +1,4 @@
+from clabgen.cli import main
+
+
+main()
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+import contextlib
+import io
+import os
+import re
+import time
+import traceback
+
+from clabgen.models import RenderOptions
+from clabgen.validate import SolverValidationError
+
+
+TOPOLOGY_NAME = "fabric.clab.yml"
+JSON_TOPOLOGY_NAME = "fabric.clab.json"
+BRIDGES_NAME = "vm-bridges-generated.nix"
+IFACE_MAP_NAME = "fabric.ifmap.json"
+LOG_NAME = "render.log"
+
+
+@dataclass
+class BatchResult:
+    input: str
+    key: str
+    ok: bool
+    seconds: float
+    nodes: int = 0
+    links: int = 0
+    error: str = ""
+
+
+def discover_inputs(paths: List[str]) -> List[Tuple[Path, str]]:
+    found: List[Tuple[Path, str]] = []
+
+    for raw in paths:
+        path = Path(raw)
+        if path.is_dir():
+            for file in sorted(path.rglob("*.json")):
+                rel = file.relative_to(path).with_suffix("")
+                found.append((file, "-".join(rel.parts)))
+        else:
+            found.append((path, path.stem))
+
+    keys: Dict[str, int] = {}
+    result: List[Tuple[Path, str]] = []
+    for file, key in found:
+        key = re.sub(r"[^A-Za-z0-9._-]+", "-", key).strip("-") or "input"
+        count = keys.get(key, 0)
+        keys[key] = count + 1
+        result.append((file, key if count == 0 else f"{key}-{count}"))
+
+    return result
+
+
+BatchJob = Tuple[str, str, str, RenderOptions, str, Dict[str, Any]]
+
+
+def _error_summary(e: Exception) -> str:
+    if isinstance(e, SolverValidationError) and e.errors:
+        more = f" (+{len(e.errors) - 1} more)" if len(e.errors) > 1 else ""
+        return f"{type(e).__name__}: {e.errors[0]}{more}"
+
+    return f"{type(e).__name__}: {e}".splitlines()[0]
+
+
+def _render_one(job: BatchJob) -> BatchResult:
+    solver_json, key, out_dir, options, output_format, provenance = job
+    target = Path(out_dir) / key
+    target.mkdir(parents=True, exist_ok=True)
+
+    log = io.StringIO()
+    start = time.perf_counter()
+
+    try:
+        from clabgen import parse_solver_json
+
+        with contextlib.redirect_stdout(log):
+            merged = parse_solver_json.write_outputs(
+                solver_json,
+                target / (JSON_TOPOLOGY_NAME if output_format == "json" else TOPOLOGY_NAME),
+                target / BRIDGES_NAME,
+                options,
+                iface_map=target / IFACE_MAP_NAME,
+                output_format=output_format,
+                provenance=provenance,
+            )
+    except Exception as e:
+        log.write(traceback.format_exc())
+        result = BatchResult(
+            input=solver_json,
+            key=key,
+            ok=False,
+            seconds=time.perf_counter() - start,
+            error=_error_summary(e),
+        )
+    else:
+        result = BatchResult(
+            input=solver_json,
+            key=key,
+            ok=True,
+            seconds=time.perf_counter() - start,
+            nodes=len(merged["topology"]["nodes"]),
+            links=len(merged["topology"]["links"]),
+        )
+
+    (target / LOG_NAME).write_text(log.getvalue())
+    return result
+
+
+def _warm() -> None:
+    from clabgen import parse_solver_json
+
+    _ = parse_solver_json
+
+
+def run_batch(
+    inputs: List[Tuple[Path, str]],
+    out_dir: str | Path,
+    options: RenderOptions | None = None,
+    jobs: int | None = None,
+    output_format: str = "yaml",
+) -> List[BatchResult]:
+    if not inputs:
+        return []
+
+    from clabgen.parse_solver_json import render_provenance
+
+    options = options or RenderOptions()
+    provenance = render_provenance()
+    work: List[BatchJob] = [
+        (str(path), key, str(out_dir), options, output_format, provenance)
+        for path, key in inputs
+    ]
+
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(work)))
+    if jobs == 1:
+        _warm()
+        return [_render_one(job) for job in work]
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_warm) as pool:
+        return list(pool.map(_render_one, work))
+
+
+def format_summary(results: List[BatchResult]) -> str:
+    width = max([len(r.key) for r in results] + [5])
+    lines = [f"{'input':<{width}}  status  {'seconds':>8}  {'nodes':>6}  {'links':>6}  error"]
+
+    for r in results:
+        lines.append(
+            f"{r.key:<{width}}  {'ok' if r.ok else 'FAILED':<6}  {r.seconds:8.2f}"
+            f"  {r.nodes:>6}  {r.links:>6}  {r.error}"
+        )
+
+    failed = sum(1 for r in results if not r.ok)
+    lines.append(
+        f"{len(results)} inputs, {len(results) - failed} ok, {failed} failed,"
+        f" {sum(r.seconds for r in results):.2f}s render time"
+    )
+    return "\n".join(lines)
@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+import io
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from clabgen import clab_json, clab_yaml, json_decode
+
+
+IMPORT_MODULES = ("clabgen.cli", "clabgen.parse_solver_json")
+IMPORT_BUDGET_MS = 150.0
+# Imported on first use only: the YAML writer and the orjson backend of
+# json_decode/clab_json.
+IMPORT_LAZY = ("yaml", "orjson")
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _legacy_yaml(merged: Dict[str, Any]) -> str:
+    import yaml
+
+    return yaml.safe_dump(
+        {
+            "name": merged["name"],
+            "topology": merged["topology"],
+        },
+        sort_keys=False,
+    )
+
+
+def _streaming_yaml(merged: Dict[str, Any]) -> str:
+    f = io.StringIO()
+    clab_yaml.write_topology(f, merged)
+    return f.getvalue()
+
+
+def _json(merged: Dict[str, Any]) -> str:
+    f = io.StringIO()
+    clab_json.write_topology(f, merged)
+    return f.getvalue()
+
+
+def _json_text(path: Path) -> Any:
+    with path.open() as f:
+        return json.load(f)
+
+
+def _peak_bytes(fn: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_decode(path: str | Path, repeat: int) -> List[str]:
+    path = Path(path)
+    decoders: List[tuple[str, Callable[[], Any]]] = [
+        ("json.load (text)", lambda: _json_text(path)),
+        ("json (bytes)", lambda: json_decode.load_file(path, "json")),
+    ]
+    if json_decode.backend("auto") == "orjson":
+        decoders.append(("orjson (mmap)", lambda: json_decode.load_file(path, "orjson")))
+
+    size = path.stat().st_size
+    lines = [f"solver file            {size / 1e6:9.1f} MB  default backend: {json_decode.backend()}"]
+    for label, fn in decoders:
+        elapsed = _time(fn, repeat)
+        peak = _peak_bytes(fn)
+        lines.append(f"{label:<22} {elapsed * 1000:9.1f} ms  peak {peak / 1e6:8.1f} MB")
+
+    return lines
+
+
+def _synthetic_solver(nodes: int, routes_per_node: int, site_size: int = 100) -> Dict[str, Any]:
+    sites: Dict[str, Any] = {}
+
+    for first in range(0, nodes, site_size):
+        site_nodes: Dict[str, Any] = {}
+        site_links: Dict[str, Any] = {}
+
+        for n in range(first, min(first + site_size, nodes)):
+            name = f"core-{n - first}"
+            link = f"p2p-{name}"
+            addr = f"10.{(n - first) // 250}.{(n - first) % 250}.1/31"
+            routes = [
+                {"dst": f"10.{100 + r // 250}.{r % 250}.0/24", "via4": addr.replace(".1/31", ".0")}
+                for r in range(routes_per_node)
+            ]
+            site_nodes[name] = {
+                "role": "core",
+                "routingDomain": "default",
+                "interfaces": {link: {"addr4": addr, "kind": "p2p", "routes": {"ipv4": routes}}},
+            }
+            site_links[link] = {"kind": "p2p", "endpoints": {name: {"addr4": addr}}}
+
+        sites[f"s{first // site_size}"] = {"nodes": site_nodes, "links": site_links}
+
+    return {"enterprise": {"bench": {"site": sites}}}
+
+
+def _baseline_site(site: Dict[str, Any]) -> Dict[str, Any]:
+    # The models before slotting and interning, as plain dicts: per-interface
+    # route lists of dict copies, and the raw links/domains kept alongside.
+    def routes(iface: Dict[str, Any], family: str, uplink: str) -> List[Dict[str, Any]]:
+        table = iface.get("routes") or {}
+        return [dict(r) for r in table.get(family) or []] + [dict(r) for r in iface.get(uplink) or []]
+
+    nodes = {
+        unit: {
+            "name": unit,
+            "role": node.get("role", ""),
+            "routing_domain": node.get("routingDomain", ""),
+            "interfaces": {
+                name: {
+                    "name": name,
+                    "addr4": iface.get("addr4"),
+                    "addr6": iface.get("addr6"),
+                    "ll6": iface.get("ll6"),
+                    "routes": {
+                        "ipv4": routes(iface, "ipv4", "uplinkRoutes4"),
+                        "ipv6": routes(iface, "ipv6", "uplinkRoutes6"),
+                    },
+                    "kind": iface.get("kind"),
+                    "upstream": iface.get("upstream"),
+                    "tenant": iface.get("tenant"),
+                    "overlay": iface.get("overlay"),
+                }
+                for name, iface in (node.get("interfaces") or {}).items()
+            },
+            "containers": list(node.get("containers", [])),
+            "isolated": bool(node.get("isolated", False)),
+        }
+        for unit, node in site.get("nodes", {}).items()
+    }
+    links = {
+        name: {"name": name, "kind": link.get("kind", "lan"), "endpoints": link.get("endpoints", {})}
+        for name, link in (site.get("links") or {}).items()
+    }
+    domains = dict(site.get("domains", {}) or {})
+
+    return {
+        "nodes": nodes,
+        "links": links,
+        "domains": domains,
+        "raw_links": dict(site.get("links", {}) or {}),
+        "raw_domains": domains,
+    }
+
+
+def _baseline_sites(document: Dict[str, Any]) -> List[Dict[str, Any]]:
+    from clabgen.solver import extract_enterprise_sites
+
+    return [_baseline_site(site) for _, _, site in extract_enterprise_sites(document)]
+
+
+def _retained(load: Callable[[], Any]) -> tuple[Any, float, int]:
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        result = load()
+        elapsed = time.perf_counter() - start
+        retained = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, retained
+
+
+def bench_models(nodes: int = 10000, routes_per_node: int = 10) -> List[str]:
+    from clabgen.s88.enterprise.site_loader import load_sites_from_document
+
+    # Round-trip through text so every string is a fresh object, as it is
+    # when the solver output comes off disk.
+    text = json.dumps(_synthetic_solver(nodes, routes_per_node))
+
+    baseline, base_elapsed, base_retained = _retained(lambda: _baseline_sites(json.loads(text)))
+    del baseline
+    sites, elapsed, retained = _retained(lambda: load_sites_from_document(json.loads(text)))
+
+    routes = nodes * routes_per_node
+    return [
+        f"site models            {elapsed * 1000:9.1f} ms  "
+        f"{len(sites)} sites, {nodes} nodes, {routes} routes",
+        f"plain dicts (baseline) {base_elapsed * 1000:9.1f} ms",
+        f"retained (baseline)    {base_retained / 1e6:9.1f} MB  {base_retained / routes:6.0f} bytes/route",
+        f"retained (models)      {retained / 1e6:9.1f} MB  {retained / routes:6.0f} bytes/route",
+        f"saved                  {(base_retained - retained) / 1e6:9.1f} MB  "
+        f"{base_retained / retained if retained else 0.0:6.2f} x",
+    ]
+
+
+def bench_render(render: Callable[[], Dict[str, Any]]) -> tuple[Dict[str, Any], List[str]]:
+    start = time.perf_counter()
+    merged = render()
+    elapsed = time.perf_counter() - start
+
+    topology = merged["topology"]
+    return merged, [
+        f"render                 {elapsed * 1000:9.1f} ms  "
+        f"{len(topology['nodes'])} nodes, {len(topology['links'])} links",
+    ]
+
+
+def bench_writers(merged: Dict[str, Any], repeat: int) -> List[str]:
+    legacy = _time(lambda: _legacy_yaml(merged), repeat)
+    streaming = _time(lambda: _streaming_yaml(merged), repeat)
+    json_time = _time(lambda: _json(merged), repeat)
+    encoder = "orjson" if clab_json.orjson is not None else "json"
+
+    return [
+        f"yaml.safe_dump         {legacy * 1000:9.1f} ms  {len(_legacy_yaml(merged)):>10} bytes",
+        f"streaming writer       {streaming * 1000:9.1f} ms  {len(_streaming_yaml(merged)):>10} bytes",
+        f"{encoder + ' (--format json)':<22} {json_time * 1000:9.1f} ms  {len(_json(merged)):>10} bytes",
+        f"speedup                {legacy / streaming if streaming else 0.0:9.2f} x",
+    ]
+
+
+def _import_times(module: str) -> Dict[str, int]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=Path(__file__).resolve().parents[1],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        times[fields[2].strip()] = int(fields[1])
+    return times
+
+
+def bench_imports(budget_ms: float = IMPORT_BUDGET_MS) -> tuple[bool, List[str]]:
+    ok = True
+    lines: List[str] = []
+
+    for module in IMPORT_MODULES:
+        times = _import_times(module)
+        elapsed = times.get(module, 0) / 1000
+        heavy = sorted(name for name in IMPORT_LAZY if name in times)
+
+        within = elapsed <= budget_ms and not heavy
+        ok = ok and within
+        lines.append(
+            f"import {module:<26} {elapsed:9.1f} ms  "
+            f"{'ok' if within else 'OVER BUDGET'} (budget {budget_ms:.0f} ms"
+            f"{', eager: ' + ','.join(heavy) if heavy else ''})"
+        )
+
+    return ok, lines
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from typing import Any, Dict, TextIO
+import json
+
+from clabgen.outputs import strip_defaults
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(value: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def write_topology(f: TextIO, merged: Dict[str, Any]) -> None:
+    topology = merged["topology"]
+    defaults = dict(topology.get("defaults", {}) or {})
+
+    document: Dict[str, Any] = {"defaults": defaults}
+    if "groups" in topology:
+        document["groups"] = topology["groups"]
+    document["nodes"] = {
+        node_name: strip_defaults(node, defaults)
+        for node_name, node in (topology.get("nodes", {}) or {}).items()
+    }
+    document["links"] = topology.get("links", []) or []
+
+    f.write(dumps({"name": merged["name"], "topology": document}))
+    f.write("\n")
+
+
+def bridges_manifest(merged: Dict[str, Any]) -> str:
+    manifest: Dict[str, Any] = {"bridges": list(merged.get("bridges", []))}
+
+    if "vlans" in merged:
+        manifest["vlanBridge"] = merged["vlan_bridge"]
+        manifest["vlans"] = dict(merged.get("vlans", {}))
+        manifest["vlanHostPorts"] = dict(merged.get("vlan_host_ports", {}))
+        manifest["vlanPorts"] = dict(merged.get("vlan_ports", {}))
+
+    return dumps(manifest) + "\n"
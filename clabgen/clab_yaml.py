@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from typing import Any, Dict, TextIO
+import json
+
+import yaml
+
+from clabgen.outputs import strip_defaults
+
+try:
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeDumper
+
+
+INDENT = "  "
+
+
+def dump(value: Any) -> str:
+    return yaml.dump(value, Dumper=SafeDumper, sort_keys=False)
+
+
+def _write_indented(f: TextIO, text: str, depth: int) -> None:
+    prefix = INDENT * depth
+    for line in text.splitlines(keepends=True):
+        f.write(prefix + line if line.strip() else line)
+
+
+class DumpCache:
+    def __init__(self) -> None:
+        self._entries: Dict[str, str] = {}
+        self._used: Dict[str, str] = {}
+
+    def dump(self, value: Any) -> str:
+        key = json.dumps(value, separators=(",", ":"))
+        text = self._entries.get(key)
+        if text is None:
+            text = dump(value)
+        self._used[key] = text
+        return text
+
+    def rotate(self) -> None:
+        self._entries, self._used = self._used, {}
+
+
+def write_topology(
+    f: TextIO,
+    merged: Dict[str, Any],
+    cache: DumpCache | None = None,
+) -> None:
+    dump_fragment = cache.dump if cache is not None else dump
+    topology = merged["topology"]
+    defaults = dict(topology.get("defaults", {}) or {})
+    nodes = topology.get("nodes", {}) or {}
+    links = topology.get("links", []) or []
+
+    f.write(dump({"name": merged["name"]}))
+    f.write("topology:\n")
+    _write_indented(f, dump({"defaults": defaults}), 1)
+
+    if "groups" in topology:
+        _write_indented(f, dump({"groups": topology["groups"]}), 1)
+
+    if not nodes:
+        f.write(f"{INDENT}nodes: {{}}\n")
+    else:
+        f.write(f"{INDENT}nodes:\n")
+        for node_name, node in nodes.items():
+            _write_indented(f, dump_fragment({node_name: strip_defaults(node, defaults)}), 2)
+
+    if not links:
+        f.write(f"{INDENT}links: []\n")
+    else:
+        f.write(f"{INDENT}links:\n")
+        for link in links:
+            _write_indented(f, dump_fragment([link]), 1)
+
+    if cache is not None:
+        cache.rotate()
@@ -0,0 +1,495 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+
+def _load_parser():
+    from clabgen import parse_solver_json
+
+    return parse_solver_json
+
+
+def _add_render_options(ap: argparse.ArgumentParser) -> None:
+    ap.add_argument(
+        "--client-mode",
+        choices=["container", "namespace"],
+        default="container",
+        help="render injected clients as one container each, or as namespaces in one container per tenant segment",
+    )
+    ap.add_argument(
+        "--wan-peer-mode",
+        choices=["per-link", "site", "enterprise"],
+        default="per-link",
+        help="emulate WAN peers as one container per uplink, or one internet container per site or enterprise",
+    )
+    ap.add_argument(
+        "--link-mode",
+        choices=["bridge", "veth"],
+        default="bridge",
+        help="render point-to-point links through a host bridge, or as direct veth pairs",
+    )
+    ap.add_argument(
+        "--bridge-mode",
+        choices=["per-segment", "vlan"],
+        default="per-segment",
+        help="one host bridge per segment, or one VLAN-filtering bridge with a VLAN per segment",
+    )
+    ap.add_argument(
+        "--groups",
+        action="store_true",
+        help="render a containerlab group per role holding the shared image and sysctl/nft exec prefix",
+    )
+
+
+def _render_options(args: argparse.Namespace):
+    from clabgen.models import RenderOptions
+
+    return RenderOptions(
+        client_mode=args.client_mode,
+        wan_peer_mode=args.wan_peer_mode,
+        link_mode=args.link_mode,
+        bridge_mode=args.bridge_mode,
+        groups=args.groups,
+    )
+
+
+def _add_iface_map_option(ap: argparse.ArgumentParser) -> None:
+    ap.add_argument(
+        "--iface-map",
+        metavar="PATH",
+        help="interface allocation map written by the previous render, read only"
+        " (default: <previous>.ifmap.json next to the previous topology, when present)",
+    )
+
+
+def _eth_allocations(args: argparse.Namespace, parser):
+    path = Path(args.iface_map) if args.iface_map else parser.iface_map_path(args.previous)
+    if not args.iface_map and not path.exists():
+        return None
+
+    from clabgen.iface_map import load_iface_map
+
+    return load_iface_map(path)
+
+
+def _render_main(argv: list[str]) -> None:
+    if len(argv) < 3:
+        print("usage: generate-clab-config.py <solver.json> <output.yml> <output-bridges.nix>")
+        raise SystemExit(1)
+
+    ap = argparse.ArgumentParser(
+        prog="generate-clab-config.py",
+        usage="generate-clab-config.py <solver.json> <output.yml> <output-bridges.nix> [options]",
+    )
+    ap.add_argument("solver_json")
+    ap.add_argument("topology_out")
+    ap.add_argument("bridges_out")
+    _add_render_options(ap)
+    ap.add_argument(
+        "--bridges-batch",
+        metavar="PATH",
+        help="also write an 'ip -batch' file creating and tuning all host bridges",
+    )
+    ap.add_argument(
+        "--shard-hosts",
+        metavar="ADDR[,ADDR...]",
+        help="partition the fabric across these hosts; writes one topology and bridges file per host and joins cut links with vxlan",
+    )
+    ap.add_argument(
+        "--manifest",
+        metavar="PATH",
+        help="also write a manifest of per-node content fingerprints for 'diff'",
+    )
+    ap.add_argument(
+        "--iface-map",
+        metavar="PATH",
+        help="interface allocation map reused and updated across renders (default: <topology>.ifmap.json next to the topology)",
+    )
+    ap.add_argument(
+        "--format",
+        choices=["yaml", "json"],
+        default="yaml",
+        help="topology file format; json skips YAML emission and also writes a compact <topology>.bridges.json",
+    )
+    ap.add_argument(
+        "--fragments",
+        metavar="DIR",
+        help="also write one topology fragment per node into DIR",
+    )
+    ap.add_argument(
+        "--site",
+        action="append",
+        metavar="SITE",
+        help="render only this site (site name or <enterprise>-<site>); repeatable",
+    )
+    ap.add_argument(
+        "--node",
+        action="append",
+        metavar="NODE",
+        help="render only this node (site-local or rendered name); repeatable",
+    )
+    ap.add_argument(
+        "--exec-script",
+        metavar="PATH",
+        help="also write a shell script replaying the rendered nodes' exec commands via docker exec",
+    )
+    ap.add_argument(
+        "--snapshot-dir",
+        metavar="DIR",
+        help="reuse loaded site models from a binary snapshot in DIR keyed by the solver file hash",
+    )
+    args = ap.parse_args(argv)
+
+    parser = _load_parser()
+    merged = parser.write_outputs(
+        args.solver_json,
+        args.topology_out,
+        args.bridges_out,
+        _render_options(args),
+        bridges_batch_out=args.bridges_batch,
+        shard_hosts=[h for h in (args.shard_hosts or "").split(",") if h],
+        manifest_out=args.manifest,
+        iface_map=args.iface_map or parser.iface_map_path(args.topology_out),
+        fragments_dir=args.fragments,
+        output_format=args.format,
+        snapshot_dir=args.snapshot_dir,
+        sites=args.site,
+        nodes=args.node,
+    )
+
+    if args.exec_script:
+        from clabgen.outputs import write_atomic
+        from clabgen.reconfigure import exec_script
+
+        write_atomic(args.exec_script, exec_script(merged, lab_name=merged["name"]))
+        Path(args.exec_script).chmod(0o755)
+
+
+def _diff_main(argv: list[str]) -> None:
+    ap = argparse.ArgumentParser(
+        prog="generate-clab-config.py diff",
+        description="compare a new render against a previous topology or manifest and print a minimal redeploy plan",
+    )
+    ap.add_argument("solver_json")
+    ap.add_argument("previous", help="previous fabric.clab.yml or manifest .json")
+    ap.add_argument(
+        "--topology",
+        default="fabric.clab.yml",
+        help="topology path used in the printed containerlab command",
+    )
+    ap.add_argument(
+        "--manifest-out",
+        metavar="PATH",
+        help="write the manifest of the new render",
+    )
+    _add_iface_map_option(ap)
+    _add_render_options(ap)
+    args = ap.parse_args(argv)
+
+    from clabgen import diff
+
+    parser = _load_parser()
+    merged = parser.render_topology(
+        args.solver_json,
+        _render_options(args),
+        _eth_allocations(args, parser),
+    )
+
+    classes = diff.diff_fingerprints(
+        diff.load_fingerprints(args.previous),
+        diff.node_fingerprints(merged),
+    )
+    print(diff.render_plan(classes, args.topology, lab_name=merged["name"]))
+
+    if args.manifest_out:
+        diff.write_manifest(merged, args.manifest_out)
+
+
+def _reconfigure_main(argv: list[str]) -> None:
+    ap = argparse.ArgumentParser(
+        prog="generate-clab-config.py reconfigure",
+        description="apply address, route and nft deltas to running nodes instead of redeploying them",
+    )
+    ap.add_argument("solver_json")
+    ap.add_argument("previous", help="previously deployed fabric.clab.yml")
+    ap.add_argument("--dry-run", action="store_true", help="print the delta operations only")
+    ap.add_argument("--workers", type=int, default=16)
+    _add_iface_map_option(ap)
+    _add_render_options(ap)
+    args = ap.parse_args(argv)
+
+    import yaml
+
+    from clabgen import reconfigure
+
+    parser = _load_parser()
+    merged = parser.render_topology(
+        args.solver_json,
+        _render_options(args),
+        _eth_allocations(args, parser),
+    )
+    previous = yaml.safe_load(Path(args.previous).read_text())
+
+    plans = reconfigure.plan_topology(previous, merged)
+
+    for plan in plans:
+        if plan.requires_redeploy:
+            print(f"[reconfigure] {plan.node}: needs redeploy")
+            continue
+        for op in plan.operations:
+            print(f"[reconfigure] {plan.node}: {op}")
+
+    if args.dry_run:
+        return
+
+    results = reconfigure.apply_plans(
+        plans,
+        reconfigure.DockerExecutor(),
+        lab_name=merged["name"],
+        workers=args.workers,
+    )
+
+    failed = {node: error for node, error in results.items() if error}
+    for node, error in sorted(failed.items()):
+        print(f"[reconfigure] {node}: FAILED {error}")
+
+    if failed:
+        raise SystemExit(1)
+
+
+def _bench_main(argv: list[str]) -> None:
+    ap = argparse.ArgumentParser(
+        prog="generate-clab-config.py bench",
+        description="time render stages on a solver output",
+    )
+    ap.add_argument("solver_json", nargs="?")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument(
+        "--import-budget",
+        type=float,
+        metavar="MS",
+        help="fail when a cold import of the CLI or renderer exceeds MS or pulls in yaml/orjson",
+    )
+    ap.add_argument(
+        "--models",
+        type=int,
+        nargs="?",
+        const=10000,
+        metavar="NODES",
+        help="load a synthetic solver document with NODES nodes of 10 routes each and report retained model memory",
+    )
+    _add_render_options(ap)
+    args = ap.parse_args(argv)
+
+    from clabgen import bench
+
+    ok, lines = bench.bench_imports(args.import_budget or bench.IMPORT_BUDGET_MS)
+
+    if args.models:
+        lines.extend(bench.bench_models(args.models))
+
+    if args.solver_json:
+        if args.solver_json != "-":
+            lines.extend(bench.bench_decode(args.solver_json, args.repeat))
+
+        parser = _load_parser()
+        merged, render_lines = bench.bench_render(
+            lambda: parser.render_topology(args.solver_json, _render_options(args))
+        )
+        lines.extend(render_lines)
+        lines.extend(bench.bench_writers(merged, args.repeat))
+
+    print("\n".join(lines))
+
+    if args.import_budget is not None and not ok:
+        raise SystemExit(1)
+
+
+def _batch_main(argv: list[str]) -> None:
+    ap = argparse.ArgumentParser(
+        prog="generate-clab-config.py batch",
+        description="render many solver outputs in one process pool, one output directory per input",
+    )
+    ap.add_argument("inputs", nargs="+", help="solver JSON files or directories searched for *.json")
+    ap.add_argument("--out-dir", required=True, metavar="DIR")
+    ap.add_argument("--jobs", type=int, metavar="N", help="worker processes (default: CPU count)")
+    ap.add_argument("--format", choices=["yaml", "json"], default="yaml")
+    _add_render_options(ap)
+    args = ap.parse_args(argv)
+
+    from clabgen import batch
+
+    inputs = batch.discover_inputs(args.inputs)
+    if not inputs:
+        print("[batch] no inputs found")
+        raise SystemExit(1)
+
+    results = batch.run_batch(
+        inputs,
+        args.out_dir,
+        _render_options(args),
+        jobs=args.jobs,
+        output_format=args.format,
+    )
+    print(batch.format_summary(results))
+
+    if not all(r.ok for r in results):
+        raise SystemExit(1)
+
+
+def _watch_main(argv: list[str]) -> None:
+    ap = argparse.ArgumentParser(
+        prog="generate-clab-config.py watch",
+        description="keep models in memory and re-render changed sites whenever the solver output or renderer-inputs.json changes",
+    )
+    ap.add_argument("solver_json")
+    ap.add_argument("topology_out")
+    ap.add_argument("bridges_out")
+    ap.add_argument("--interval", type=float, default=0.2, metavar="SECONDS", help="poll interval")
+    ap.add_argument("--format", choices=["yaml", "json"], default="yaml")
+    ap.add_argument("--bridges-batch", metavar="PATH")
+    ap.add_argument("--manifest", metavar="PATH")
+    ap.add_argument("--iface-map", metavar="PATH")
+    _add_render_options(ap)
+    args = ap.parse_args(argv)
+
+    from clabgen.watch import Watcher
+
+    parser = _load_parser()
+    watcher = Watcher(
+        args.solver_json,
+        args.topology_out,
+        args.bridges_out,
+        _render_options(args),
+        iface_map=args.iface_map or parser.iface_map_path(args.topology_out),
+        output_format=args.format,
+        bridges_batch_out=args.bridges_batch,
+        manifest_out=args.manifest,
+    )
+
+    try:
+        watcher.run(args.interval)
+    except KeyboardInterrupt:
+        pass
+
+
+def _serve_main(argv: list[str]) -> None:
+    ap = argparse.ArgumentParser(
+        prog="generate-clab-config.py serve",
+        description="run a render server on a Unix socket with warm imports and cached site renders",
+    )
+    ap.add_argument("--socket", metavar="PATH", help="socket path (default: $XDG_RUNTIME_DIR/clabgen.sock)")
+    ap.add_argument("--workers", type=int, default=4, metavar="N", help="concurrent renders")
+    args = ap.parse_args(argv)
+
+    from clabgen import server
+
+    try:
+        server.serve(args.socket, args.workers)
+    except KeyboardInterrupt:
+        pass
+
+
+def _client_main(argv: list[str]) -> None:
+    ap = argparse.ArgumentParser(
+        prog="generate-clab-config.py client",
+        description="render through a running 'serve' instance, or in-process when none is listening",
+    )
+    ap.add_argument("solver_json")
+    ap.add_argument("topology_out")
+    ap.add_argument("bridges_out")
+    ap.add_argument("--socket", metavar="PATH")
+    ap.add_argument("--format", choices=["yaml", "json"], default="yaml")
+    ap.add_argument("--iface-map", metavar="PATH")
+    _add_render_options(ap)
+    args = ap.parse_args(argv)
+
+    import dataclasses
+
+    from clabgen import server
+
+    parser = _load_parser()
+    options = _render_options(args)
+    iface_map = args.iface_map or parser.iface_map_path(args.topology_out)
+    socket_path = Path(args.socket) if args.socket else server.default_socket_path()
+
+    payload = {
+        "solver_json": str(Path(args.solver_json).resolve()),
+        "topology_out": str(Path(args.topology_out).resolve()),
+        "bridges_out": str(Path(args.bridges_out).resolve()),
+        "iface_map": str(Path(iface_map).resolve()),
+        "format": args.format,
+        "options": dataclasses.asdict(options),
+    }
+
+    try:
+        response = server.request(socket_path, payload)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"[client] no render server on {socket_path}, rendering in-process")
+        parser.write_outputs(
+            args.solver_json,
+            args.topology_out,
+            args.bridges_out,
+            options,
+            iface_map=iface_map,
+            output_format=args.format,
+        )
+        return
+
+    if not response.get("ok"):
+        print(f"[client] render failed: {response.get('error')}")
+        raise SystemExit(1)
+
+    print(
+        f"[client] rendered by server in {response['ms']} ms:"
+        f" nodes={response['nodes']} sites={response['sites']}"
+        f" rerendered={response['rerendered']}"
+    )
+
+
+def _validate_main(argv: list[str]) -> None:
+    ap = argparse.ArgumentParser(
+        prog="generate-clab-config.py validate",
+        description="check a solver output in one pass and list every schema error with its JSON path",
+    )
+    ap.add_argument("solver_json", help="solver JSON, or '-' for stdin")
+    args = ap.parse_args(argv)
+
+    from clabgen import validate
+
+    parser = _load_parser()
+    errors = validate.validate_document(parser.load_solver_input(args.solver_json))
+
+    for error in errors:
+        print(error)
+
+    if errors:
+        print(f"[validate] {len(errors)} error(s)")
+        raise SystemExit(1)
+
+    print("[validate] ok")
+
+
+COMMANDS = {
+    "batch": _batch_main,
+    "bench": _bench_main,
+    "diff": _diff_main,
+    "client": _client_main,
+    "reconfigure": _reconfigure_main,
+    "serve": _serve_main,
+    "validate": _validate_main,
+    "watch": _watch_main,
+}
+
+
+def main(argv: list[str] | None = None) -> None:
+    if argv is None:
+        argv = sys.argv[1:]
+
+    if argv and argv[0] in COMMANDS:
+        COMMANDS[argv[0]](argv[1:])
+        return
+
+    _render_main(argv)
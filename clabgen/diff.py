@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List
+import hashlib
+import json
+
+from clabgen.outputs import write_if_changed
+
+
+MANIFEST_VERSION = 2
+
+CLASSES = ("unchanged", "exec-changed", "links-changed", "added", "removed")
+
+
+def _digest(value: Any) -> str:
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def _link_nodes(link: Dict[str, Any]) -> List[str]:
+    if link.get("type") == "vxlan":
+        endpoint = link.get("endpoint") or {}
+        node_name = endpoint.get("node")
+        return [node_name] if isinstance(node_name, str) else []
+
+    result: List[str] = []
+    for endpoint in link.get("endpoints", []):
+        if not isinstance(endpoint, str) or ":" not in endpoint:
+            continue
+        node_name = endpoint.split(":", 1)[0]
+        if node_name != "host":
+            result.append(node_name)
+    return result
+
+
+def node_links(topology_doc: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    topology = topology_doc.get("topology", {}) or {}
+    nodes = topology.get("nodes", {}) or {}
+
+    result: Dict[str, List[Dict[str, Any]]] = {name: [] for name in nodes}
+    for link in topology.get("links", []) or []:
+        for node_name in _link_nodes(link):
+            result.setdefault(node_name, []).append(link)
+
+    return result
+
+
+def resolve_nodes(topology_doc: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    topology = topology_doc.get("topology", {}) or {}
+    defaults = dict(topology.get("defaults", {}) or {})
+    kinds = topology.get("kinds", {}) or {}
+    groups = topology.get("groups", {}) or {}
+
+    result: Dict[str, Dict[str, Any]] = {}
+    for name, node in (topology.get("nodes", {}) or {}).items():
+        node = node or {}
+        group = groups.get(node.get("group"), {}) or {}
+        kind = node.get("kind") or group.get("kind") or defaults.get("kind")
+        layers = (defaults, kinds.get(kind, {}) or {}, group, node)
+
+        # Like containerlab: later layers override earlier ones key by key,
+        # and exec is taken whole from the most specific layer that has one.
+        resolved: Dict[str, Any] = {}
+        exec_cmds: List[str] = []
+        for layer in layers:
+            resolved.update((k, v) for k, v in layer.items() if k not in ("exec", "group"))
+            exec_cmds = list(layer.get("exec", []) or []) or exec_cmds
+
+        if exec_cmds:
+            resolved["exec"] = exec_cmds
+        result[name] = resolved
+
+    return result
+
+
+def node_fingerprints(topology_doc: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
+    nodes = resolve_nodes(topology_doc)
+    links = node_links(topology_doc)
+
+    return {
+        name: {
+            "node": _digest(nodes[name]),
+            "links": _digest(sorted(_digest(link) for link in links.get(name, []))),
+        }
+        for name in sorted(nodes)
+    }
+
+
+def build_manifest(topology_doc: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "version": MANIFEST_VERSION,
+        "nodes": node_fingerprints(topology_doc),
+    }
+
+
+def write_manifest(topology_doc: Dict[str, Any], path: str | Path) -> None:
+    write_if_changed(path, json.dumps(build_manifest(topology_doc), indent=2, sort_keys=True) + "\n")
+
+
+def load_fingerprints(path: str | Path) -> Dict[str, Dict[str, str]]:
+    path = Path(path)
+    text = path.read_text()
+
+    if path.suffix == ".json":
+        manifest = json.loads(text)
+        if not isinstance(manifest, dict) or not isinstance(manifest.get("nodes"), dict):
+            raise ValueError(f"{path} is not a render manifest")
+        if manifest.get("version") != MANIFEST_VERSION:
+            raise ValueError(
+                f"{path} has manifest version {manifest.get('version')!r}, expected {MANIFEST_VERSION}"
+            )
+        return dict(manifest["nodes"])
+
+    import yaml
+
+    topology_doc = yaml.safe_load(text)
+    if not isinstance(topology_doc, dict):
+        raise ValueError(f"{path} is not a containerlab topology")
+
+    return node_fingerprints(topology_doc)
+
+
+def diff_fingerprints(
+    old: Dict[str, Dict[str, str]],
+    new: Dict[str, Dict[str, str]],
+) -> Dict[str, List[str]]:
+    result: Dict[str, List[str]] = {name: [] for name in CLASSES}
+
+    for name in sorted(set(old) | set(new)):
+        if name not in old:
+            result["added"].append(name)
+        elif name not in new:
+            result["removed"].append(name)
+        elif old[name].get("links") != new[name].get("links"):
+            result["links-changed"].append(name)
+        elif old[name].get("node") != new[name].get("node"):
+            result["exec-changed"].append(name)
+        else:
+            result["unchanged"].append(name)
+
+    return result
+
+
+def redeploy_nodes(classes: Dict[str, List[str]]) -> List[str]:
+    return sorted(
+        set(classes["added"])
+        | set(classes["exec-changed"])
+        | set(classes["links-changed"])
+    )
+
+
+def render_plan(
+    classes: Dict[str, List[str]],
+    topology_path: str,
+    lab_name: str = "fabric",
+) -> str:
+    lines = ["class           nodes"]
+    for name in CLASSES:
+        lines.append(f"{name:<15} {len(classes[name])}")
+
+    for name in CLASSES[1:]:
+        for node_name in classes[name]:
+            lines.append(f"  {name}: {node_name}")
+
+    targets = redeploy_nodes(classes)
+
+    if classes["removed"]:
+        containers = " ".join(f"clab-{lab_name}-{n}" for n in classes["removed"])
+        lines.append(f"remove: docker rm -f {containers}")
+
+    if targets:
+        lines.append(
+            "redeploy: containerlab deploy -t "
+            f"{topology_path} --reconfigure --node-filter {','.join(targets)}"
+        )
+    else:
+        lines.append("redeploy: nothing to do")
+
+    return "\n".join(lines)
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict
+import json
+
+from clabgen.outputs import write_if_changed
+
+
+IFACE_MAP_VERSION = 1
+
+EthAllocations = Dict[str, Dict[str, Dict[str, int]]]
+
+
+def load_iface_map(path: str | Path) -> EthAllocations:
+    path = Path(path)
+    if not path.exists():
+        return {}
+
+    doc = json.loads(path.read_text())
+    if not isinstance(doc, dict) or not isinstance(doc.get("sites"), dict):
+        raise ValueError(f"{path} is not an interface allocation map")
+    if doc.get("version") != IFACE_MAP_VERSION:
+        raise ValueError(
+            f"{path} has interface map version {doc.get('version')!r}, expected {IFACE_MAP_VERSION}"
+        )
+
+    return {
+        site_key: {
+            node_name: {str(iface): int(eth) for iface, eth in eth_map.items()}
+            for node_name, eth_map in nodes.items()
+        }
+        for site_key, nodes in doc["sites"].items()
+    }
+
+
+def merge_iface_map(previous: EthAllocations, current: EthAllocations) -> EthAllocations:
+    merged: EthAllocations = {
+        site_key: {node_name: dict(eth_map) for node_name, eth_map in nodes.items()}
+        for site_key, nodes in previous.items()
+    }
+
+    for site_key, nodes in current.items():
+        site_nodes = merged.setdefault(site_key, {})
+        for node_name, eth_map in nodes.items():
+            site_nodes[node_name] = dict(eth_map)
+
+    return merged
+
+
+def write_iface_map(allocations: EthAllocations, path: str | Path) -> None:
+    doc: Dict[str, Any] = {
+        "version": IFACE_MAP_VERSION,
+        "sites": allocations,
+    }
+    write_if_changed(path, json.dumps(doc, indent=2, sort_keys=True) + "\n")
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Callable
+import json
+import mmap
+import os
+
+
+ENV_JSON_BACKEND = "CLABGEN_JSON_BACKEND"
+
+BACKENDS = ("auto", "orjson", "json")
+
+_UNSET = object()
+_orjson_loads: Any = _UNSET
+
+
+def _orjson() -> Callable[[Any], Any] | None:
+    global _orjson_loads
+
+    if _orjson_loads is _UNSET:
+        try:
+            import orjson
+        except ImportError:
+            _orjson_loads = None
+        else:
+            _orjson_loads = orjson.loads
+
+    return _orjson_loads
+
+
+def backend(name: str | None = None) -> str:
+    name = name or os.environ.get(ENV_JSON_BACKEND) or "auto"
+    if name not in BACKENDS:
+        raise ValueError(f"unknown JSON backend {name!r}, expected one of {', '.join(BACKENDS)}")
+
+    if name == "json":
+        return "json"
+
+    if _orjson() is not None:
+        return "orjson"
+
+    if name == "orjson":
+        raise RuntimeError("JSON backend 'orjson' requested but orjson is not installed")
+
+    return "json"
+
+
+def loads(data: bytes | bytearray | memoryview, backend_name: str | None = None) -> Any:
+    if backend(backend_name) == "orjson":
+        return _orjson()(data)
+
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def load_file(path: str | Path, backend_name: str | None = None) -> Any:
+    use_orjson = backend(backend_name) == "orjson"
+
+    with open(path, "rb") as f:
+        if not use_orjson or os.fstat(f.fileno()).st_size == 0:
+            return loads(f.read(), "orjson" if use_orjson else "json")
+
+        # orjson parses straight out of the page cache; the stdlib parser
+        # needs a str, so it gets the bytes and decodes them once.
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return _orjson()(view)
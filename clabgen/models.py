@@ -1,10 +1,93 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any, Tuple
+import sys
 
 
-@dataclass
+def intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+
+class Route(Mapping):
+    # One solver route. Almost every route only carries dst plus via4, via6
+    # or proto, so those are slots and anything else goes to `extra`.
+    __slots__ = ("dst", "via4", "via6", "proto", "extra")
+
+    _FIELDS = ("dst", "via4", "via6", "proto")
+
+    def __init__(
+        self,
+        dst: str,
+        via4: str | None = None,
+        via6: str | None = None,
+        proto: str | None = None,
+        extra: Tuple[Tuple[str, Any], ...] = (),
+    ) -> None:
+        self.dst = dst
+        self.via4 = via4
+        self.via6 = via6
+        self.proto = proto
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, raw: Mapping) -> "Route":
+        if isinstance(raw, Route):
+            return raw
+        extra: Tuple[Tuple[str, Any], ...] = ()
+        if not raw.keys() <= _ROUTE_FIELDS:
+            extra = tuple((intern(k), v) for k, v in raw.items() if k not in _ROUTE_FIELDS)
+        get = raw.get
+        return cls(
+            intern(get("dst")),
+            intern(get("via4")),
+            intern(get("via6")),
+            intern(get("proto")),
+            extra,
+        )
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._FIELDS:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        else:
+            for name, value in self.extra:
+                if name == key:
+                    return value
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self._FIELDS:
+            if getattr(self, key) is not None:
+                yield key
+        for name, _ in self.extra:
+            yield name
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"Route({dict(self.items())!r})"
+
+    def __reduce__(self) -> Any:
+        return (Route, (self.dst, self.via4, self.via6, self.proto, self.extra))
+
+
+_ROUTE_FIELDS = frozenset(Route._FIELDS)
+
+RouteTable = Dict[str, Tuple[Route, ...]]
+
+
+def route_table(ipv4: Any = (), ipv6: Any = ()) -> RouteTable:
+    return {
+        "ipv4": tuple(Route.from_dict(r) for r in ipv4),
+        "ipv6": tuple(Route.from_dict(r) for r in ipv6),
+    }
+
+
+@dataclass(slots=True)
 class ControlModuleModel:
     name: str
     logical_id: str
@@ -12,29 +95,27 @@ class ControlModuleModel:
     spec: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class EquipmentModuleModel:
     name: str
     kind: str
     spec: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class InterfaceModel:
     name: str
     addr4: Optional[str] = None
     addr6: Optional[str] = None
     ll6: Optional[str] = None
-    routes: Dict[str, List[Dict[str, Any]]] = field(
-        default_factory=lambda: {"ipv4": [], "ipv6": []}
-    )
+    routes: RouteTable = field(default_factory=route_table)
     kind: Optional[str] = None
     upstream: Optional[str] = None
     tenant: Optional[str] = None
     overlay: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class NodeModel:
     name: str
     role: str
@@ -49,14 +130,14 @@ class NodeModel:
     nat_intents: List[Dict[str, Any]] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LinkModel:
     name: str
     kind: str
     endpoints: Dict[str, Dict[str, Any]]
 
 
-@dataclass
+@dataclass(slots=True)
 class SiteModel:
     enterprise: str
     site: str
@@ -66,9 +147,7 @@ class SiteModel:
     domains: Dict[str, Any]
     raw_policy: Dict[str, Any] = field(default_factory=dict)
     raw_nat: Dict[str, Any] = field(default_factory=dict)
-    raw_links: Dict[str, Any] = field(default_factory=dict)
     raw_ownership: Dict[str, Any] = field(default_factory=dict)
-    raw_domains: Dict[str, Any] = field(default_factory=dict)
     raw_transport: Dict[str, Any] = field(default_factory=dict)
     renderer_inventory: Dict[str, Any] = field(default_factory=dict)
     provider_zone_map: Dict[str, str] = field(default_factory=dict)
@@ -77,3 +156,12 @@ class SiteModel:
     policy_node_name: str = ""
     upstream_selector_node_name: str = ""
     tenant_prefix_owners: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class RenderOptions:
+    client_mode: str = "container"
+    wan_peer_mode: str = "per-link"
+    link_mode: str = "bridge"
+    bridge_mode: str = "per-segment"
+    groups: bool = False
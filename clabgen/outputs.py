@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Callable, Dict, TextIO
+import os
+import tempfile
+
+
+PROVENANCE_BEGIN = "# --- provenance ---"
+PROVENANCE_END = "# --- end provenance ---"
+
+
+def strip_defaults(node: Dict[str, Any], defaults: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        key: value
+        for key, value in node.items()
+        if key not in ("kind", "image") or defaults.get(key) != value
+    }
+
+
+def strip_provenance(text: str) -> str:
+    lines = text.splitlines(keepends=True)
+
+    try:
+        begin = next(i for i, line in enumerate(lines) if line.rstrip("\n") == PROVENANCE_BEGIN)
+        end = next(
+            i for i, line in enumerate(lines)
+            if i > begin and line.rstrip("\n") == PROVENANCE_END
+        )
+    except StopIteration:
+        return text
+
+    return "".join(lines[:begin] + lines[end + 1:])
+
+
+def _same_content(path: Path, content: str) -> bool:
+    try:
+        existing = path.read_text()
+    except (FileNotFoundError, UnicodeDecodeError):
+        return False
+
+    return strip_provenance(existing) == strip_provenance(content)
+
+
+def _stream_atomic(path: Path, emit: Callable[[TextIO], None], only_if_changed: bool) -> bool:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+
+    try:
+        with os.fdopen(fd, "w") as f:
+            emit(f)
+
+        if only_if_changed and _same_content(path, Path(tmp).read_text()):
+            os.unlink(tmp)
+            return False
+
+        if path.exists():
+            os.chmod(tmp, path.stat().st_mode & 0o777)
+        else:
+            os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+    return True
+
+
+def write_atomic(path: str | Path, content: str) -> None:
+    _stream_atomic(Path(path), lambda f: f.write(content), only_if_changed=False)
+
+
+def write_if_changed(path: str | Path, content: str) -> bool:
+    path = Path(path)
+
+    if _same_content(path, content):
+        return False
+
+    write_atomic(path, content)
+    return True
+
+
+def stream_if_changed(path: str | Path, emit: Callable[[TextIO], None]) -> bool:
+    return _stream_atomic(Path(path), emit, only_if_changed=True)
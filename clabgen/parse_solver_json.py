@@ -0,0 +1,506 @@
+from __future__ import annotations
+
+import copy
+import io
+import json
+import sys
+from pathlib import Path
+from typing import Any, Collection, Dict, List, Tuple
+
+from clabgen.diff import node_links, write_manifest
+from clabgen.iface_map import EthAllocations, load_iface_map, merge_iface_map, write_iface_map
+from clabgen import json_decode
+from clabgen.models import RenderOptions
+from clabgen.provenance import renderer_meta
+from clabgen.outputs import PROVENANCE_BEGIN, PROVENANCE_END, stream_if_changed, write_if_changed
+from clabgen.s88.enterprise.enterprise import Enterprise, select_site_keys
+from clabgen.s88.enterprise.site_loader import load_sites_from_document, site_candidates
+from clabgen.solver import load_solver
+from clabgen.s88.enterprise.shard import shard_topology
+from clabgen.s88.enterprise.groups import PREAMBLE_DIR, preamble_script
+from clabgen.s88.enterprise.vlan_bridge import vlan_ports_script
+
+
+def _render_meta_comment(meta: Dict[str, Any]) -> str:
+    lines = [PROVENANCE_BEGIN]
+    for line in json.dumps(meta, indent=2, sort_keys=True).splitlines():
+        lines.append(f"# {line}")
+    lines.append(PROVENANCE_END)
+    return "\n".join(lines)
+
+
+STDIN = "-"
+
+_INVENTORY_CACHE: Dict[Path, Tuple[int, Dict[str, Any]]] = {}
+
+
+def renderer_inventory_path(base_dir: Path | None = None) -> Path:
+    if base_dir is None:
+        base_dir = Path(__file__).resolve().parents[1]
+    return base_dir / "renderer-inputs.json"
+
+
+def _load_renderer_inventory(base_dir: Path) -> Dict[str, Any]:
+    inventory_file = renderer_inventory_path(base_dir)
+
+    if not inventory_file.exists():
+        return {"hosts": {}}
+
+    mtime = inventory_file.stat().st_mtime_ns
+    cached = _INVENTORY_CACHE.get(inventory_file)
+    if cached is not None and cached[0] == mtime:
+        return copy.deepcopy(cached[1])
+
+    with inventory_file.open() as f:
+        data = json.load(f)
+
+    if not isinstance(data, dict):
+        raise ValueError("renderer-inputs.json top-level must be an object")
+
+    _INVENTORY_CACHE[inventory_file] = (mtime, data)
+    return copy.deepcopy(data)
+
+
+def _render_nix_attrs(name: str, values: Dict[str, int]) -> str:
+    return (
+        f"  {name} = {{\n"
+        + "".join(f'    "{key}" = {value};\n' for key, value in sorted(values.items()))
+        + "  };\n"
+    )
+
+
+def _render_bridges_nix(merged: Dict[str, Any]) -> str:
+    bridges = list(merged.get("bridges", []))
+
+    body = (
+        "{ lib, ... }:\n"
+        "{\n"
+        "  bridges = [\n"
+        + "\n".join(f'    "{b}"' for b in bridges)
+        + "\n"
+        "  ];\n"
+    )
+
+    if "vlans" in merged:
+        body += f'  vlanBridge = "{merged["vlan_bridge"]}";\n'
+        body += _render_nix_attrs("vlans", dict(merged.get("vlans", {})))
+        body += _render_nix_attrs("vlanHostPorts", dict(merged.get("vlan_host_ports", {})))
+
+    return body + "}\n"
+
+
+BRIDGE_TUNING = (
+    "stp_state 0 forward_delay 0 mcast_snooping 0"
+    " nf_call_iptables 0 nf_call_ip6tables 0 nf_call_arptables 0"
+)
+
+
+def _host_stubs(merged: Dict[str, Any]) -> List[Tuple[str, str]]:
+    stubs: set[Tuple[str, str]] = set()
+
+    for link in merged.get("topology", {}).get("links", []):
+        labels = dict(link.get("labels", {}) or {})
+        if labels.get("clab.link.type") != "bridge":
+            continue
+
+        bridge = labels.get("clab.link.bridge")
+        for endpoint in link.get("endpoints", []):
+            if isinstance(endpoint, str) and endpoint.startswith("host:"):
+                stubs.add((endpoint.split(":", 1)[1], str(bridge)))
+
+    return sorted(stubs)
+
+
+def _render_bridges_batch(merged: Dict[str, Any]) -> str:
+    lines = [
+        "# ip -batch input for the host L2 layer.",
+        "# Apply with: ip -force -batch <file>",
+        "# Host stub lines only succeed once containerlab has created the stubs,",
+        "# so apply it again after 'containerlab deploy'.",
+    ]
+
+    if merged.get("vlan_bridge") in merged.get("bridges", []):
+        lines.append(
+            "# VLAN membership of the stub ports is in the companion .vlans batch file"
+            " (bridge -batch)."
+        )
+
+    vlan_bridge = merged.get("vlan_bridge")
+
+    for bridge in merged.get("bridges", []):
+        tuning = BRIDGE_TUNING
+        if bridge == vlan_bridge:
+            tuning += " vlan_filtering 1 vlan_default_pvid 0"
+
+        lines.extend(
+            [
+                f"link add name {bridge} type bridge",
+                f"link set dev {bridge} type bridge {tuning}",
+                f"link set dev {bridge} up",
+            ]
+        )
+
+    for stub, bridge in _host_stubs(merged):
+        lines.extend(
+            [
+                f"link set dev {stub} master {bridge}",
+                f"link set dev {stub} up",
+            ]
+        )
+
+    return "\n".join(lines) + "\n"
+
+
+def bridge_vlan_batch_path(bridges_batch_out: str | Path) -> Path:
+    path = Path(bridges_batch_out)
+    return path.with_name(f"{path.stem}.vlans{path.suffix}")
+
+
+def _render_bridge_vlan_batch(merged: Dict[str, Any]) -> str:
+    lines = [
+        "# bridge -batch input with the access VLAN of each host stub port.",
+        "# Apply with: bridge -force -batch <file>, after the ip -batch file.",
+        "# Container ports get theirs from the .vlans.sh script after deploy.",
+    ]
+
+    for stub, vid in sorted(dict(merged.get("vlan_host_ports", {})).items()):
+        lines.append(f"vlan add dev {stub} vid {vid} pvid untagged")
+
+    return "\n".join(lines) + "\n"
+
+
+def load_renderer_inventory() -> Dict[str, Any]:
+    return _load_renderer_inventory(renderer_inventory_path().parent)
+
+
+def topology_text(
+    merged: Dict[str, Any],
+    output_format: str = "yaml",
+    provenance: Dict[str, Any] | None = None,
+) -> str:
+    f = io.StringIO()
+    if output_format == "json":
+        from clabgen import clab_json
+
+        clab_json.write_topology(f, merged)
+    else:
+        from clabgen import clab_yaml
+
+        comment = _render_meta_comment(provenance or render_provenance())
+        f.write(f"{comment}\n# fabric.clab.yml\n")
+        clab_yaml.write_topology(f, merged)
+    return f.getvalue()
+
+
+def bridges_text(merged: Dict[str, Any]) -> str:
+    return _render_bridges_nix(merged)
+
+
+def render_from_document(
+    document: Dict[str, Any],
+    inventory: Dict[str, Any] | None = None,
+    options: RenderOptions | None = None,
+    eth_allocations: EthAllocations | None = None,
+    sites: Collection[str] | None = None,
+    nodes: Collection[str] | None = None,
+    trusted: bool = False,
+) -> Dict[str, Any]:
+    if not isinstance(document, dict):
+        raise ValueError("solver JSON top-level must be an object")
+
+    site_models = load_sites_from_document(
+        document,
+        renderer_inventory=inventory if inventory is not None else {"hosts": {}},
+        site_keys=select_site_keys(site_candidates(document), sites, nodes),
+        trusted=trusted,
+    )
+    return Enterprise(site_models).render(options, eth_allocations, sites=sites, nodes=nodes)
+
+
+def load_solver_input(solver_json: str | Path) -> Dict[str, Any]:
+    if str(solver_json) == STDIN:
+        data = json_decode.loads(sys.stdin.buffer.read())
+        if not isinstance(data, dict):
+            raise ValueError("solver JSON top-level must be an object")
+        return data
+
+    return load_solver(Path(solver_json))
+
+
+def render_topology(
+    solver_json: str | Path,
+    options: RenderOptions | None = None,
+    eth_allocations: EthAllocations | None = None,
+    snapshot_dir: str | Path | None = None,
+    sites: Collection[str] | None = None,
+    nodes: Collection[str] | None = None,
+) -> Dict[str, Any]:
+    if snapshot_dir is not None and str(solver_json) != STDIN:
+        from clabgen import snapshot
+
+        site_models, _ = snapshot.load_sites(
+            solver_json,
+            load_renderer_inventory(),
+            snapshot_dir,
+            sites=sites,
+            nodes=nodes,
+        )
+        return Enterprise(site_models).render(options, eth_allocations, sites=sites, nodes=nodes)
+
+    return render_from_document(
+        load_solver_input(solver_json),
+        inventory=load_renderer_inventory(),
+        options=options,
+        eth_allocations=eth_allocations,
+        sites=sites,
+        nodes=nodes,
+    )
+
+
+def iface_map_path(topology_out: str | Path) -> Path:
+    path = Path(topology_out)
+    name = path.name
+    if ".clab." in name:
+        return path.with_name(f"{name.split('.clab.', 1)[0]}.ifmap.json")
+    return path.with_name(f"{path.stem}.ifmap.json")
+
+
+def _shard_path(path: Path, index: int) -> Path:
+    name = path.name
+    if ".clab." in name:
+        head, tail = name.split(".clab.", 1)
+        return path.with_name(f"{head}.h{index}.clab.{tail}")
+    return path.with_name(f"{path.stem}.h{index}{path.suffix}")
+
+
+OUTPUT_FORMATS = ("yaml", "json")
+
+
+def _bridges_manifest_path(topology_out: Path) -> Path:
+    name = topology_out.name
+    if ".clab." in name:
+        return topology_out.with_name(f"{name.split('.clab.', 1)[0]}.bridges.json")
+    return topology_out.with_name(f"{topology_out.stem}.bridges.json")
+
+
+FRAGMENT_SUFFIX = ".node.clab.yml"
+
+
+def vlan_script_path(topology_out: str | Path) -> Path:
+    path = Path(topology_out)
+    name = path.name
+    if ".clab." in name:
+        return path.with_name(f"{name.split('.clab.', 1)[0]}.vlans.sh")
+    return path.with_name(f"{path.stem}.vlans.sh")
+
+
+def _write_fragments(merged: Dict[str, Any], comment: str, fragments_dir: Path) -> None:
+    from clabgen import clab_yaml
+
+    fragments_dir.mkdir(parents=True, exist_ok=True)
+
+    nodes = merged["topology"]["nodes"]
+    links = node_links(merged)
+    written = 0
+
+    for node_name in sorted(nodes):
+        fragment = clab_yaml.dump(
+            {
+                "name": node_name,
+                "node": nodes[node_name],
+                "links": links.get(node_name, []),
+            }
+        )
+        if write_if_changed(fragments_dir / f"{node_name}{FRAGMENT_SUFFIX}", f"{comment}\n{fragment}"):
+            written += 1
+
+    stale = [
+        path
+        for path in fragments_dir.glob(f"*{FRAGMENT_SUFFIX}")
+        if path.name[: -len(FRAGMENT_SUFFIX)] not in nodes
+    ]
+    for path in stale:
+        path.unlink()
+
+    print(
+        f"[fragments] dir={fragments_dir} nodes={len(nodes)}"
+        f" written={written} removed={len(stale)}"
+    )
+
+
+def _write_preambles(preambles: Dict[str, List[str]], preamble_dir: Path) -> None:
+    preamble_dir.mkdir(parents=True, exist_ok=True)
+
+    for name, commands in sorted(preambles.items()):
+        write_if_changed(preamble_dir / name, preamble_script(commands))
+
+    for stale in preamble_dir.glob("*.sh"):
+        if stale.name not in preambles:
+            stale.unlink()
+
+
+def _write_rendered(
+    merged: Dict[str, Any],
+    comment: str,
+    topology_out: Path,
+    bridges_out: Path,
+    bridges_batch_out: Path | None,
+    fragments_dir: Path | None = None,
+    output_format: str = "yaml",
+    yaml_cache: Any = None,
+) -> None:
+    def emit_yaml(f) -> None:
+        from clabgen import clab_yaml
+
+        f.write(f"{comment}\n# fabric.clab.yml\n")
+        clab_yaml.write_topology(f, merged, yaml_cache)
+
+    def emit_json(f) -> None:
+        clab_json.write_topology(f, merged)
+
+    if output_format == "json":
+        from clabgen import clab_json
+
+        stream_if_changed(topology_out, emit_json)
+        write_if_changed(_bridges_manifest_path(topology_out), clab_json.bridges_manifest(merged))
+    else:
+        stream_if_changed(topology_out, emit_yaml)
+
+    write_if_changed(bridges_out, _render_bridges_nix(merged))
+
+    if bridges_batch_out is not None:
+        write_if_changed(bridges_batch_out, _render_bridges_batch(merged))
+        if "vlans" in merged:
+            write_if_changed(
+                bridge_vlan_batch_path(bridges_batch_out),
+                _render_bridge_vlan_batch(merged),
+            )
+
+    if merged.get("preambles"):
+        _write_preambles(merged["preambles"], topology_out.parent / PREAMBLE_DIR)
+
+    if "vlans" in merged:
+        script = vlan_script_path(topology_out)
+        write_if_changed(script, vlan_ports_script(merged, lab_name=merged["name"]))
+        script.chmod(0o755)
+
+    if fragments_dir is not None:
+        _write_fragments(merged, comment, fragments_dir)
+
+
+def render_provenance() -> Dict[str, Any]:
+    repo_root = Path(__file__).resolve().parents[1]
+    return {
+        "renderer": renderer_meta(repo_root),
+    }
+
+
+def write_outputs(
+    solver_json: str | Path,
+    topology_out: str | Path,
+    bridges_out: str | Path,
+    options: RenderOptions | None = None,
+    bridges_batch_out: str | Path | None = None,
+    shard_hosts: List[str] | None = None,
+    manifest_out: str | Path | None = None,
+    iface_map: str | Path | None = None,
+    fragments_dir: str | Path | None = None,
+    output_format: str = "yaml",
+    provenance: Dict[str, Any] | None = None,
+    snapshot_dir: str | Path | None = None,
+    sites: Collection[str] | None = None,
+    nodes: Collection[str] | None = None,
+) -> Dict[str, Any]:
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"unknown output format {output_format!r}")
+
+    allocations = load_iface_map(iface_map) if iface_map is not None else None
+    merged = render_topology(solver_json, options, allocations, snapshot_dir, sites, nodes)
+
+    if iface_map is not None:
+        write_iface_map(merge_iface_map(allocations or {}, merged["eth_maps"]), iface_map)
+
+    write_merged(
+        merged,
+        topology_out,
+        bridges_out,
+        bridges_batch_out=bridges_batch_out,
+        shard_hosts=shard_hosts,
+        manifest_out=manifest_out,
+        fragments_dir=fragments_dir,
+        output_format=output_format,
+        provenance=provenance,
+    )
+    return merged
+
+
+def write_merged(
+    merged: Dict[str, Any],
+    topology_out: str | Path,
+    bridges_out: str | Path,
+    bridges_batch_out: str | Path | None = None,
+    shard_hosts: List[str] | None = None,
+    manifest_out: str | Path | None = None,
+    fragments_dir: str | Path | None = None,
+    output_format: str = "yaml",
+    provenance: Dict[str, Any] | None = None,
+    yaml_cache: Any = None,
+) -> None:
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"unknown output format {output_format!r}")
+
+    topology_out = Path(topology_out)
+    bridges_out = Path(bridges_out)
+    batch_out = Path(bridges_batch_out) if bridges_batch_out is not None else None
+    fragments = Path(fragments_dir) if fragments_dir is not None else None
+
+    if manifest_out is not None:
+        write_manifest(merged, manifest_out)
+
+    if provenance is None:
+        provenance = render_provenance()
+
+    if not shard_hosts:
+        comment = _render_meta_comment(provenance)
+        _write_rendered(
+            merged,
+            comment,
+            topology_out,
+            bridges_out,
+            batch_out,
+            fragments,
+            output_format,
+            yaml_cache,
+        )
+        return
+
+    for shard in shard_topology(merged, list(shard_hosts)):
+        host = shard["host"]
+        index = host["index"]
+        comment = _render_meta_comment(
+            {
+                **provenance,
+                "shard": {
+                    "index": index,
+                    "address": host["address"],
+                    "hosts": len(shard_hosts),
+                },
+            }
+        )
+
+        _write_rendered(
+            shard,
+            comment,
+            _shard_path(topology_out, index),
+            _shard_path(bridges_out, index),
+            _shard_path(batch_out, index) if batch_out is not None else None,
+            fragments / f"h{index}" if fragments is not None else None,
+            output_format,
+        )
+
+        print(
+            f"[shard] host={index} address={host['address']}"
+            f" nodes={len(shard['topology']['nodes'])}"
+            f" bridges={len(shard['bridges'])}"
+            f" cut_links={host['cut_links']}"
+        )
@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+import hashlib
+import os
+import stat
+import struct
+import zlib
+
+
+ENV_GIT_REV = "CLABGEN_GIT_REV"
+ENV_GIT_DIRTY = "CLABGEN_GIT_DIRTY"
+
+SCHEMA_VERSION = 2
+
+
+def _git_dir(repo: Path) -> Path | None:
+    dot_git = repo / ".git"
+
+    if dot_git.is_dir():
+        return dot_git
+
+    if dot_git.is_file():
+        text = dot_git.read_text().strip()
+        if text.startswith("gitdir:"):
+            git_dir = Path(text[len("gitdir:"):].strip())
+            return git_dir if git_dir.is_absolute() else (repo / git_dir).resolve()
+
+    return None
+
+
+def _common_dir(git_dir: Path) -> Path:
+    common = git_dir / "commondir"
+    if not common.is_file():
+        return git_dir
+    path = Path(common.read_text().strip())
+    return path if path.is_absolute() else (git_dir / path).resolve()
+
+
+def _resolve_ref(git_dir: Path, ref: str) -> str | None:
+    for base in (git_dir, _common_dir(git_dir)):
+        ref_file = base / ref
+        if ref_file.is_file():
+            return ref_file.read_text().strip()
+
+    packed = _common_dir(git_dir) / "packed-refs"
+    if packed.is_file():
+        for line in packed.read_text().splitlines():
+            if line.startswith(("#", "^")):
+                continue
+            sha, _, name = line.partition(" ")
+            if name == ref:
+                return sha
+
+    return None
+
+
+def git_rev(repo: Path) -> str:
+    override = os.environ.get(ENV_GIT_REV)
+    if override:
+        return override
+
+    try:
+        git_dir = _git_dir(repo)
+        if git_dir is None:
+            return "unknown"
+
+        head = (git_dir / "HEAD").read_text().strip()
+        if not head.startswith("ref:"):
+            return head
+
+        return _resolve_ref(git_dir, head[len("ref:"):].strip()) or "unknown"
+    except OSError:
+        return "unknown"
+
+
+IndexEntry = Tuple[bytes, Tuple[int, ...], bytes, int]
+
+
+def _varint(data: bytes, pos: int) -> Tuple[int, int]:
+    # Offset encoding of index v4 path prefixes.
+    byte = data[pos]
+    value = byte & 0x7F
+    while byte & 0x80:
+        pos += 1
+        byte = data[pos]
+        value = ((value + 1) << 7) | (byte & 0x7F)
+    return value, pos + 1
+
+
+def _read_index(git_dir: Path) -> Tuple[List[IndexEntry], bytes | None]:
+    # Entries (path, stat fields, blob sha, flags) and the root tree sha of
+    # the cache-tree extension, if it is valid.
+    data = (git_dir / "index").read_bytes()
+    signature, version, count = struct.unpack_from(">4sLL", data)
+    if signature != b"DIRC" or version not in (2, 3, 4):
+        raise ValueError(f"unsupported index version {version}")
+
+    entries: List[IndexEntry] = []
+    pos = 12
+    path = b""
+    for _ in range(count):
+        entry_start = pos
+        fields = struct.unpack_from(">10L", data, pos)
+        sha = data[pos + 40 : pos + 60]
+        (flags,) = struct.unpack_from(">H", data, pos + 60)
+        pos += 62
+        if flags & 0x4000:
+            (extended,) = struct.unpack_from(">H", data, pos)
+            flags |= extended << 16
+            pos += 2
+        if version == 4:
+            strip, pos = _varint(data, pos)
+            end = data.index(b"\0", pos)
+            path = path[: len(path) - strip] + data[pos:end]
+            pos = end + 1
+        else:
+            end = data.index(b"\0", pos)
+            path = data[pos:end]
+            # NUL-padded to a multiple of eight bytes.
+            pos = entry_start + ((end - entry_start + 8) & ~7)
+        entries.append((path, fields, sha, flags))
+
+    root: bytes | None = None
+    while pos + 8 <= len(data) - 20:
+        name, size = struct.unpack_from(">4sL", data, pos)
+        body = data[pos + 8 : pos + 8 + size]
+        if name == b"link":
+            raise ValueError("split index")
+        if name == b"TREE":
+            header, _, rest = body.partition(b"\n")
+            entry_count = int(header.split(b"\0", 1)[1].split(b" ", 1)[0])
+            if entry_count >= 0:
+                root = rest[:20]
+        pos += 8 + size
+
+    return entries, root
+
+
+def _object_dirs(git_dir: Path) -> Iterator[Path]:
+    yield git_dir / "objects"
+    common = _common_dir(git_dir)
+    if common != git_dir:
+        yield common / "objects"
+
+
+def _packed_object(pack_dir: Path, sha: bytes) -> bytes | None:
+    for idx_path in pack_dir.glob("*.idx"):
+        idx = idx_path.read_bytes()
+        if idx[:8] != b"\xfftOc\x00\x00\x00\x02":
+            continue
+        total = struct.unpack_from(">L", idx, 8 + 255 * 4)[0]
+        lo = struct.unpack_from(">L", idx, 8 + (sha[0] - 1) * 4)[0] if sha[0] else 0
+        hi = struct.unpack_from(">L", idx, 8 + sha[0] * 4)[0]
+        names = 8 + 256 * 4
+        while lo < hi:
+            mid = (lo + hi) // 2
+            name = idx[names + mid * 20 : names + mid * 20 + 20]
+            if name == sha:
+                break
+            if name < sha:
+                lo = mid + 1
+            else:
+                hi = mid
+        else:
+            continue
+
+        offsets = names + total * 24
+        (offset,) = struct.unpack_from(">L", idx, offsets + mid * 4)
+        if offset & 0x80000000:
+            (offset,) = struct.unpack_from(">Q", idx, offsets + total * 4 + (offset & 0x7FFFFFFF) * 8)
+
+        with (pack_dir / f"{idx_path.stem}.pack").open("rb") as f:
+            f.seek(offset)
+            byte = f.read(1)[0]
+            if (byte >> 4) & 7 != 1:
+                # Deltified commits would need the whole chain resolved.
+                return None
+            while byte & 0x80:
+                byte = f.read(1)[0]
+            inflate = zlib.decompressobj()
+            body = b""
+            while not inflate.eof:
+                chunk = f.read(4096)
+                if not chunk:
+                    break
+                body += inflate.decompress(chunk)
+            return body
+
+    return None
+
+
+def _commit_body(git_dir: Path, rev: str) -> bytes | None:
+    sha = bytes.fromhex(rev)
+    for objects in _object_dirs(git_dir):
+        loose = objects / rev[:2] / rev[2:]
+        if loose.is_file():
+            header, _, body = zlib.decompress(loose.read_bytes()).partition(b"\0")
+            return body if header.startswith(b"commit ") else None
+        body = _packed_object(objects / "pack", sha)
+        if body is not None:
+            return body
+    return None
+
+
+def _blob_sha(path: Path, mode: int) -> bytes:
+    if stat.S_ISLNK(mode):
+        content = os.readlink(path).encode()
+    else:
+        content = path.read_bytes()
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).digest()
+
+
+def _worktree_changed(repo: Path, entries: List[IndexEntry], index_mtime: float) -> bool:
+    for path, fields, sha, flags in entries:
+        ctime_s, ctime_ns, mtime_s, mtime_ns, _, _, mode, _, _, size = fields
+        # Unmerged stages and intent-to-add entries are changes by themselves.
+        if flags & 0x3000 or flags & 0x20000000:
+            return True
+        if flags & 0x40000000 or stat.S_ISDIR(mode) or mode == 0o160000:
+            # skip-worktree, sparse directories and submodules.
+            continue
+
+        target = repo / os.fsdecode(path)
+        try:
+            st = target.lstat()
+        except OSError:
+            return True
+
+        if stat.S_IFMT(st.st_mode) != stat.S_IFMT(mode):
+            return True
+        if stat.S_ISREG(mode) and (st.st_mode & 0o100) != (mode & 0o100):
+            return True
+        if st.st_size & 0xFFFFFFFF != size:
+            return True
+
+        same_stat = (
+            int(st.st_mtime) & 0xFFFFFFFF == mtime_s
+            and st.st_mtime_ns % 1_000_000_000 == mtime_ns
+            and int(st.st_ctime) & 0xFFFFFFFF == ctime_s
+            and st.st_ctime_ns % 1_000_000_000 == ctime_ns
+        )
+        # Like git, only trust the stat data when the file was not modified
+        # in the same instant the index was written ("racy" entries).
+        if same_stat and st.st_mtime < index_mtime:
+            continue
+        if _blob_sha(target, mode) != sha:
+            return True
+
+    return False
+
+
+def git_dirty(repo: Path) -> bool:
+    override = os.environ.get(ENV_GIT_DIRTY)
+    if override:
+        return override.lower() in ("1", "true", "yes")
+
+    git_dir = _git_dir(repo)
+    if git_dir is None:
+        # Not a checkout: there is nothing to prove the tree is clean.
+        return True
+
+    # The index is compared with the worktree and with HEAD in Python, so
+    # a render never spawns git. Whatever cannot be read counts as dirty.
+    try:
+        entries, root = _read_index(git_dir)
+        if _worktree_changed(repo, entries, (git_dir / "index").stat().st_mtime):
+            return True
+        if root is None:
+            return True
+
+        rev = git_rev(repo)
+        if rev == "unknown":
+            return True
+        commit = _commit_body(git_dir, rev)
+        if commit is None:
+            # HEAD is deltified or in an alternate; the valid cache-tree
+            # already says nothing was staged since the last commit.
+            return False
+        return not commit.startswith(b"tree " + root.hex().encode())
+    except (OSError, ValueError, IndexError, struct.error, zlib.error):
+        return True
+
+
+def renderer_meta(repo: Path) -> Dict[str, Any]:
+    return {
+        "name": repo.name,
+        "gitRev": git_rev(repo),
+        "gitDirty": git_dirty(repo),
+        "schemaVersion": SCHEMA_VERSION,
+    }
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Protocol, Tuple
+import shlex
+import subprocess
+import threading
+
+from clabgen.diff import resolve_nodes
+
+
+# (family, type, dst, table, metric): what makes two routes distinct to the
+# kernel. `ip route replace` with the same key overwrites the route.
+RouteKey = Tuple[str, str, str, str, str]
+
+ROUTE_TYPES = (
+    "unicast",
+    "local",
+    "broadcast",
+    "multicast",
+    "throw",
+    "unreachable",
+    "prohibit",
+    "blackhole",
+    "nat",
+)
+
+
+@dataclass
+class NodeState:
+    addrs: Dict[Tuple[str, str, str], str] = field(default_factory=dict)
+    routes: Dict[RouteKey, str] = field(default_factory=dict)
+    nft: List[str] = field(default_factory=list)
+    other: List[str] = field(default_factory=list)
+
+
+@dataclass
+class Operation:
+    argv: List[str]
+    stdin: str | None = None
+
+    def __str__(self) -> str:
+        text = shlex.join(self.argv)
+        if self.stdin is not None:
+            text += f" <<< ({len(self.stdin.splitlines())} lines)"
+        return text
+
+
+@dataclass
+class NodePlan:
+    node: str
+    operations: List[Operation] = field(default_factory=list)
+    requires_redeploy: bool = False
+
+
+class Executor(Protocol):
+    def run(self, container: str, argv: List[str], stdin: str | None = None) -> None:
+        ...
+
+
+class DockerExecutor:
+    def __init__(self, docker: str = "docker") -> None:
+        self.docker = docker
+
+    def run(self, container: str, argv: List[str], stdin: str | None = None) -> None:
+        cmd = [self.docker, "exec"]
+        if stdin is not None:
+            cmd.append("-i")
+        cmd.extend([container, *argv])
+
+        subprocess.run(
+            cmd,
+            input=stdin.encode() if stdin is not None else None,
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+
+
+class FakeExecutor:
+    def __init__(self) -> None:
+        self.calls: List[Tuple[str, List[str], str | None]] = []
+        self._lock = threading.Lock()
+
+    def run(self, container: str, argv: List[str], stdin: str | None = None) -> None:
+        with self._lock:
+            self.calls.append((container, list(argv), stdin))
+
+
+def _ip_args(tokens: List[str]) -> Tuple[str, List[str]] | None:
+    family = "4"
+    rest = tokens[1:]
+
+    while rest and rest[0].startswith("-"):
+        flag = rest.pop(0)
+        if flag == "-6":
+            family = "6"
+        elif flag == "-4":
+            family = "4"
+        else:
+            return None
+
+    return family, rest
+
+
+def _nft_statement(cmd: str) -> str:
+    statement = cmd.strip()[len("nft"):].strip()
+    if len(statement) >= 2 and statement[0] == statement[-1] == "'":
+        statement = statement[1:-1]
+    return statement
+
+
+def _route_key(family: str, args: List[str]) -> RouteKey:
+    route_type = args.pop(0) if args[0] in ROUTE_TYPES and len(args) > 1 else ""
+    dst = args[0]
+    options: Dict[str, str] = {}
+    for name, value in zip(args[1:], args[2:]):
+        if name in ("table", "metric") and name not in options:
+            options[name] = value
+        elif name in ("priority", "preference") and "metric" not in options:
+            options["metric"] = value
+    return family, route_type, dst, options.get("table", ""), options.get("metric", "")
+
+
+def _route_del(key: RouteKey) -> List[str]:
+    family, route_type, dst, table, metric = key
+    argv = ["ip", *_family_flag(family), "route", "del"]
+    if route_type:
+        argv.append(route_type)
+    argv.append(dst)
+    if table:
+        argv.extend(["table", table])
+    if metric:
+        argv.extend(["metric", metric])
+    return argv
+
+
+def parse_node_state(exec_cmds: List[str]) -> NodeState:
+    state = NodeState()
+
+    for cmd in exec_cmds:
+        tokens = shlex.split(cmd)
+        if not tokens:
+            continue
+
+        if tokens[0] == "nft":
+            if len(tokens) > 1 and tokens[1] == "list":
+                continue
+            state.nft.append(_nft_statement(cmd))
+            continue
+
+        parsed = _ip_args(tokens) if tokens[0] == "ip" else None
+        if parsed is not None:
+            family, rest = parsed
+
+            if rest[:2] == ["addr", "replace"] and "dev" in rest:
+                dev = rest[rest.index("dev") + 1]
+                spec = " ".join(rest[2:rest.index("dev")])
+                state.addrs[(family, spec, dev)] = cmd
+                continue
+
+            if rest[:2] == ["route", "replace"] and len(rest) > 2:
+                state.routes[_route_key(family, rest[2:])] = cmd
+                continue
+
+        state.other.append(cmd)
+
+    return state
+
+
+def _family_flag(family: str) -> List[str]:
+    return ["-6"] if family == "6" else []
+
+
+def plan_node(node: str, old_exec: List[str], new_exec: List[str]) -> NodePlan:
+    old = parse_node_state(old_exec)
+    new = parse_node_state(new_exec)
+    plan = NodePlan(node=node)
+
+    if old.other != new.other:
+        plan.requires_redeploy = True
+        return plan
+
+    for key in sorted(set(new.addrs) - set(old.addrs)):
+        plan.operations.append(Operation(shlex.split(new.addrs[key])))
+
+    for key in sorted(set(old.routes) - set(new.routes)):
+        plan.operations.append(Operation(_route_del(key)))
+
+    for key in sorted(new.routes):
+        if old.routes.get(key) != new.routes[key]:
+            plan.operations.append(Operation(shlex.split(new.routes[key])))
+
+    for family, spec, dev in sorted(set(old.addrs) - set(new.addrs)):
+        plan.operations.append(
+            Operation(["ip", *_family_flag(family), "addr", "del", *spec.split(), "dev", dev])
+        )
+
+    if old.nft != new.nft:
+        body = [line for line in new.nft if line != "flush ruleset"]
+        script = "\n".join(["flush ruleset", *body]) + "\n"
+        plan.operations.append(Operation(["nft", "-f", "-"], stdin=script))
+
+    return plan
+
+
+def plan_topology(
+    old_topology: Dict[str, Any],
+    new_topology: Dict[str, Any],
+) -> List[NodePlan]:
+    old_nodes = resolve_nodes(old_topology)
+    new_nodes = resolve_nodes(new_topology)
+
+    plans: List[NodePlan] = []
+    for node_name in sorted(set(old_nodes) & set(new_nodes)):
+        plan = plan_node(
+            node_name,
+            list(old_nodes[node_name].get("exec", [])),
+            list(new_nodes[node_name].get("exec", [])),
+        )
+        if plan.operations or plan.requires_redeploy:
+            plans.append(plan)
+
+    return plans
+
+
+def exec_script(topology_doc: Dict[str, Any], lab_name: str = "fabric") -> str:
+    lines = ["#!/bin/sh", "set -e"]
+
+    for node_name, node in sorted(resolve_nodes(topology_doc).items()):
+        container = f"clab-{lab_name}-{node_name}"
+        lines.append("")
+        lines.append(f"docker exec -i {shlex.quote(container)} sh -e <<'CLABGEN_EOF'")
+        lines.extend(node.get("exec", []))
+        lines.append("CLABGEN_EOF")
+
+    return "\n".join(lines) + "\n"
+
+
+def apply_plans(
+    plans: List[NodePlan],
+    executor: Executor,
+    lab_name: str = "fabric",
+    workers: int = 16,
+) -> Dict[str, str | None]:
+    def apply(plan: NodePlan) -> Tuple[str, str | None]:
+        container = f"clab-{lab_name}-{plan.node}"
+        try:
+            for op in plan.operations:
+                executor.run(container, op.argv, op.stdin)
+        except (OSError, subprocess.CalledProcessError) as e:
+            return plan.node, str(e)
+        return plan.node, None
+
+    live = [plan for plan in plans if not plan.requires_redeploy]
+    if not live:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(live)))) as pool:
+        return dict(pool.map(apply, live))
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+import hashlib
+import json
+import threading
+
+from clabgen.models import RenderOptions, SiteModel
+from clabgen.s88.enterprise.enterprise import Enterprise, TopologyCache
+from clabgen.s88.enterprise.site_loader import load_site
+from clabgen.solver import extract_enterprise_sites
+
+
+def _digest(value: Any) -> str:
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class RenderCache:
+    def __init__(self, max_sites: int = 512) -> None:
+        self.max_sites = max_sites
+        self.topologies = TopologyCache(max_sites * 2)
+        self._sites: "OrderedDict[str, SiteModel]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _cached_site(self, digest: str) -> SiteModel | None:
+        with self._lock:
+            site = self._sites.get(digest)
+            if site is not None:
+                self._sites.move_to_end(digest)
+            return site
+
+    def _store_site(self, digest: str, site: SiteModel) -> None:
+        with self._lock:
+            self._sites[digest] = site
+            self._sites.move_to_end(digest)
+            while len(self._sites) > self.max_sites:
+                self._sites.popitem(last=False)
+
+    def load(
+        self,
+        data: Dict[str, Any],
+        renderer_inventory: Dict[str, Any],
+    ) -> Tuple[Dict[str, SiteModel], Dict[str, str], int]:
+        solver_meta = dict(data.get("meta", {}) or {})
+        shared = _digest([solver_meta, renderer_inventory])
+
+        sites: Dict[str, SiteModel] = {}
+        digests: Dict[str, str] = {}
+        reloaded = 0
+
+        for enterprise, site_name, site in extract_enterprise_sites(data):
+            key = f"{enterprise}-{site_name}"
+            digest = _digest([shared, enterprise, site_name, site])
+            digests[key] = digest
+
+            model = self._cached_site(digest)
+            if model is None:
+                model = load_site(
+                    enterprise,
+                    site_name,
+                    site,
+                    solver_meta=solver_meta,
+                    renderer_inventory=renderer_inventory,
+                )
+                self._store_site(digest, model)
+                reloaded += 1
+
+            sites[key] = model
+
+        return sites, digests, reloaded
+
+    def render(
+        self,
+        data: Dict[str, Any],
+        renderer_inventory: Dict[str, Any],
+        options: RenderOptions | None = None,
+        eth_allocations: Dict[str, Any] | None = None,
+    ) -> Tuple[Dict[str, Any], Dict[str, int]]:
+        sites, digests, reloaded = self.load(data, renderer_inventory)
+
+        enterprise = Enterprise(sites, digests, topology_cache=self.topologies)
+        merged = enterprise.render(options, eth_allocations)
+
+        return merged, {
+            "sites": len(sites),
+            "reloaded": reloaded,
+            "rerendered": len(enterprise.rendered_sites),
+        }
@@ -2,21 +2,28 @@ from __future__ import annotations
 
 from typing import Callable, Dict, List, Any
 
+from .client_namespaces import render as render_client_namespaces
 from .empty import render as render_empty
 from .forwarding import render as render_forwarding
 from .nat import render as render_nat
 from .firewall import render as render_firewall
 from .firewall_wan import render as render_wan_firewall
+from .uplink_namespaces import render as render_uplink_namespaces
 
 
 CM_BY_ROLE: Dict[str, List[tuple[str, Callable[[Dict[str, Any]], List[str]]]]] = {
     "access": [("empty", render_empty)],
-    "client": [("empty", render_empty)],
+    "client": [("empty", render_empty), ("client_namespaces", render_client_namespaces)],
     "core": [("forwarding", render_forwarding), ("wan_firewall", render_wan_firewall)],
     "policy": [("forwarding", render_forwarding), ("firewall", render_firewall)],
     "upstream-selector": [("forwarding", render_forwarding)],
     "wan-peer": [("forwarding", render_forwarding), ("nat", render_nat)],
     "isp": [("forwarding", render_forwarding)],
+    "internet": [
+        ("forwarding", render_forwarding),
+        ("nat", render_nat),
+        ("uplink_namespaces", render_uplink_namespaces),
+    ],
 }
 
 
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+
+def _render_namespace(parent: str, index: int, namespace: Dict[str, Any]) -> List[str]:
+    ns = namespace.get("name")
+    if not isinstance(ns, str) or not ns:
+        return []
+
+    tmp = f"mv{index}"
+    cmds: List[str] = [
+        f"sh -c 'ip netns exec {ns} true 2>/dev/null || ip netns add {ns}'",
+        f"ip link add link {parent} name {tmp} type macvlan mode bridge",
+        f"ip link set {tmp} netns {ns}",
+        f"ip -n {ns} link set {tmp} name eth0",
+    ]
+
+    mac = namespace.get("mac")
+    if isinstance(mac, str) and mac:
+        cmds.append(f"ip -n {ns} link set eth0 address {mac}")
+
+    cmds.extend(
+        [
+            f"ip -n {ns} link set lo up",
+            f"ip -n {ns} link set eth0 up",
+        ]
+    )
+
+    addr4 = namespace.get("addr4")
+    addr6 = namespace.get("addr6")
+    gateway4 = namespace.get("gateway4")
+    gateway6 = namespace.get("gateway6")
+
+    if isinstance(addr4, str) and addr4:
+        cmds.append(f"ip -n {ns} addr replace {addr4} dev eth0")
+    if isinstance(addr6, str) and addr6:
+        cmds.append(f"ip -n {ns} -6 addr replace {addr6} dev eth0")
+    if isinstance(addr4, str) and addr4 and isinstance(gateway4, str) and gateway4:
+        cmds.append(f"ip -n {ns} route replace default via {gateway4} dev eth0")
+    if isinstance(addr6, str) and addr6 and isinstance(gateway6, str) and gateway6:
+        cmds.append(f"ip -n {ns} -6 route replace default via {gateway6} dev eth0")
+
+    return cmds
+
+
+def render(input_data: Dict[str, Any]) -> List[str]:
+    parent = input_data.get("parent")
+    namespaces = input_data.get("namespaces", [])
+
+    if not isinstance(parent, str) or not parent:
+        return []
+    if not isinstance(namespaces, list):
+        raise RuntimeError("client_namespaces.namespaces must be an array")
+
+    cmds: List[str] = []
+    for index, namespace in enumerate(namespaces):
+        if not isinstance(namespace, dict):
+            continue
+        cmds.extend(_render_namespace(parent, index, namespace))
+
+    return cmds
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+import ipaddress
+
+
+TRANSIT_V4 = ipaddress.ip_network("198.18.0.0/15")
+
+
+def _transit(index: int) -> tuple[str, str]:
+    if (index + 1) * 2 > TRANSIT_V4.num_addresses:
+        raise RuntimeError(f"uplink namespace transit range exhausted at index {index}")
+
+    root = TRANSIT_V4.network_address + index * 2
+    return str(root), str(root + 1)
+
+
+def _render_uplink(index: int, uplink: Dict[str, Any]) -> List[str]:
+    eth = uplink.get("eth")
+    if not isinstance(eth, str) or not eth:
+        return []
+
+    ns = f"up{index}"
+    root_if = f"{ns}-r"
+    ns_if = f"{ns}-n"
+    root_ip, ns_ip = _transit(index)
+
+    cmds: List[str] = [
+        f"sh -c 'ip netns exec {ns} true 2>/dev/null || ip netns add {ns}'",
+        f"ip link set {eth} netns {ns}",
+        f"ip link add {root_if} type veth peer name {ns_if}",
+        f"ip link set {ns_if} netns {ns}",
+        f"ip addr replace {root_ip}/31 dev {root_if}",
+        f"ip link set {root_if} up",
+        f"ip -n {ns} link set lo up",
+        f"ip -n {ns} link set {eth} up",
+        f"ip -n {ns} link set {ns_if} up",
+        f"ip -n {ns} addr replace {ns_ip}/31 dev {ns_if}",
+    ]
+
+    addr4 = uplink.get("addr4")
+    addr6 = uplink.get("addr6")
+
+    if isinstance(addr4, str) and addr4:
+        cmds.append(f"ip -n {ns} addr replace {addr4} dev {eth}")
+    if isinstance(addr6, str) and addr6:
+        cmds.append(f"ip -n {ns} -6 addr replace {addr6} dev {eth}")
+
+    cmds.extend(
+        [
+            f"ip -n {ns} route replace default via {root_ip} dev {ns_if}",
+            f"ip netns exec {ns} sysctl -w net.ipv4.ip_forward=1",
+            f"ip netns exec {ns} sysctl -w net.ipv6.conf.all.forwarding=1",
+            f"ip netns exec {ns} nft add table ip nat",
+            f"ip netns exec {ns} nft 'add chain ip nat postrouting {{ type nat hook postrouting priority 100 ; }}'",
+            f'ip netns exec {ns} nft add rule ip nat postrouting oifname "{ns_if}" masquerade',
+        ]
+    )
+
+    return cmds
+
+
+def render(input_data: Dict[str, Any]) -> List[str]:
+    uplinks = input_data.get("uplinks", [])
+    if not isinstance(uplinks, list):
+        raise RuntimeError("uplink_namespaces.uplinks must be an array")
+
+    cmds: List[str] = []
+    for index, uplink in enumerate(uplinks):
+        if not isinstance(uplink, dict):
+            continue
+        cmds.extend(_render_uplink(index, uplink))
+
+    return cmds
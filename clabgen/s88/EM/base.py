@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Mapping
 
 from .roles import (
     parse_access,
@@ -16,7 +16,7 @@ from .default import render as render_default
 def _parse(
     role: str,
     node_name: str,
-    node_data: Dict[str, Any],
+    node_data: Mapping[str, Any],
     eth_map: Dict[str, int],
 ) -> Dict[str, Any]:
     r = str(role or "").strip()
@@ -41,16 +41,16 @@ def _parse(
 
 def _default_cm_inputs(
     role: str,
-    node_data: Dict[str, Any],
+    node_data: Mapping[str, Any],
     parsed: Dict[str, Any],
 ) -> Dict[str, Any]:
     cm_inputs: Dict[str, Any] = {}
 
-    if role in {"core", "policy", "upstream-selector", "wan-peer", "isp"}:
+    if role in {"core", "policy", "upstream-selector", "wan-peer", "isp", "internet"}:
         cm_inputs["forwarding"] = {
             "enable_ipv4": True,
             "enable_ipv6": True,
-            "disable_eth0": role not in {"wan-peer", "isp"},
+            "disable_eth0": role not in {"wan-peer", "isp", "internet"},
         }
 
     if role == "core":
@@ -66,6 +66,11 @@ def _default_cm_inputs(
         if isinstance(policy_firewall_state, dict):
             cm_inputs["firewall"] = policy_firewall_state
 
+    if role == "client":
+        client_namespaces = node_data.get("client_namespaces", {})
+        if isinstance(client_namespaces, dict):
+            cm_inputs["client_namespaces"] = client_namespaces
+
     if role == "wan-peer":
         fabric_link = ((parsed.get("links") or {}).get("fabric") or {})
         fabric_eth = fabric_link.get("eth")
@@ -74,13 +79,18 @@ def _default_cm_inputs(
                 "wan_interface": f"eth{fabric_eth}",
             }
 
+    if role == "internet":
+        uplink_namespaces = node_data.get("uplink_namespaces", {})
+        if isinstance(uplink_namespaces, dict):
+            cm_inputs["uplink_namespaces"] = uplink_namespaces
+
     return cm_inputs
 
 
 def render(
     role: str,
     node_name: str,
-    node_data: Dict[str, Any],
+    node_data: Mapping[str, Any],
     eth_map: Dict[str, int],
     routing_mode: str = "static",
     disable_dynamic: bool = True,
@@ -89,7 +99,6 @@ def render(
     _ = disable_dynamic
 
     parsed = _parse(role, node_name, node_data, eth_map)
-    node_data["_s88_links"] = parsed
-    node_data["_cm_inputs"] = _default_cm_inputs(role, node_data, parsed)
+    cm_inputs = _default_cm_inputs(role, node_data, parsed)
 
-    return render_default(role, node_name, node_data, eth_map)
+    return render_default(role, node_name, node_data, eth_map, cm_inputs)
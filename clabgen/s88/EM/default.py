@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Mapping, Sequence
 import ipaddress
 
 from clabgen.s88.CM.base import render as render_cm
 
 
-def _is_virtual_interface(iface: Dict[str, Any]) -> bool:
+def _is_virtual_interface(iface: Mapping[str, Any]) -> bool:
     return bool(
         iface.get("virtual") is True
         or iface.get("logical") is True
@@ -49,7 +49,7 @@ def _first_usable_host(addr: str) -> str:
     return f"{first}/{net.prefixlen}"
 
 
-def _normalize_l3_addr(addr: str, iface: Dict[str, Any]) -> str:
+def _normalize_l3_addr(addr: str, iface: Mapping[str, Any]) -> str:
     if not isinstance(addr, str) or not addr:
         return addr
 
@@ -81,37 +81,44 @@ def _p2p_peer(addr: str) -> str | None:
     return None
 
 
-def _route_lists(iface: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+def _route_lists(
+    iface: Mapping[str, Any],
+    trusted: bool = False,
+) -> Mapping[str, Sequence[Mapping[str, Any]]]:
     routes = iface.get("routes")
     if routes is None:
         routes = {}
-    if not isinstance(routes, dict):
+
+    if trusted:
+        return routes
+
+    if not isinstance(routes, Mapping):
         raise ValueError("interface.routes must be an object")
 
     ipv4 = routes.get("ipv4", [])
     ipv6 = routes.get("ipv6", [])
 
-    if not isinstance(ipv4, list):
+    if not isinstance(ipv4, (list, tuple)):
         raise ValueError("interface.routes.ipv4 must be an array")
 
-    if not isinstance(ipv6, list):
+    if not isinstance(ipv6, (list, tuple)):
         raise ValueError("interface.routes.ipv6 must be an array")
 
     return {
-        "ipv4": [dict(r) for r in ipv4 if isinstance(r, dict)],
-        "ipv6": [dict(r) for r in ipv6 if isinstance(r, dict)],
+        "ipv4": [r for r in ipv4 if isinstance(r, Mapping)],
+        "ipv6": [r for r in ipv6 if isinstance(r, Mapping)],
     }
 
 
-def _dst(r: Dict[str, Any]) -> str | None:
+def _dst(r: Mapping[str, Any]) -> str | None:
     return r.get("dst")
 
 
-def _via4(r: Dict[str, Any]) -> str | None:
+def _via4(r: Mapping[str, Any]) -> str | None:
     return r.get("via4")
 
 
-def _via6(r: Dict[str, Any]) -> str | None:
+def _via6(r: Mapping[str, Any]) -> str | None:
     return r.get("via6")
 
 
@@ -147,7 +154,7 @@ def _addr_ip(addr: str | None) -> str | None:
 
 
 def _conflicts_with_wan_peer(
-    node: Dict[str, Any],
+    node: Mapping[str, Any],
     ifname: str,
     addr: str | None,
 ) -> bool:
@@ -160,7 +167,7 @@ def _conflicts_with_wan_peer(
     for other_ifname, other_iface in interfaces.items():
         if other_ifname == ifname:
             continue
-        if not isinstance(other_iface, dict):
+        if not isinstance(other_iface, Mapping):
             continue
         if other_iface.get("kind") != "wan":
             continue
@@ -174,7 +181,7 @@ def _conflicts_with_wan_peer(
     return False
 
 
-def _connected_prefixes(node: Dict[str, Any]) -> tuple[set[str], set[str]]:
+def _connected_prefixes(node: Mapping[str, Any]) -> tuple[set[str], set[str]]:
     connected4: set[str] = set()
     connected6: set[str] = set()
 
@@ -197,7 +204,7 @@ def _connected_prefixes(node: Dict[str, Any]) -> tuple[set[str], set[str]]:
     return connected4, connected6
 
 
-def _local_ips(node: Dict[str, Any]) -> tuple[set[str], set[str]]:
+def _local_ips(node: Mapping[str, Any]) -> tuple[set[str], set[str]]:
     local4: set[str] = set()
     local6: set[str] = set()
 
@@ -261,7 +268,7 @@ def _same_subnet(gateway: str | None, iface_addr: str | None) -> bool:
         return False
 
 
-def _route_family(route: Dict[str, Any]) -> int | None:
+def _route_family(route: Mapping[str, Any]) -> int | None:
     dst = _dst(route)
 
     if isinstance(dst, str) and dst:
@@ -281,7 +288,7 @@ def _route_family(route: Dict[str, Any]) -> int | None:
     return None
 
 
-def _route_via_is_local(route: Dict[str, Any], family: int, local4: set[str], local6: set[str]) -> bool:
+def _route_via_is_local(route: Mapping[str, Any], family: int, local4: set[str], local6: set[str]) -> bool:
     if family == 4:
         via = _via4(route)
         return isinstance(via, str) and via in local4
@@ -291,9 +298,12 @@ def _route_via_is_local(route: Dict[str, Any], family: int, local4: set[str], lo
     return False
 
 
-def _effective_via4(node: Dict[str, Any], iface: Dict[str, Any], route: Dict[str, Any]) -> str | None:
+def _effective_via4(
+    iface: Mapping[str, Any],
+    route: Mapping[str, Any],
+    local4: set[str],
+) -> str | None:
     via = _via4(route)
-    local4, _ = _local_ips(node)
 
     if via in local4:
         via = None
@@ -313,9 +323,12 @@ def _effective_via4(node: Dict[str, Any], iface: Dict[str, Any], route: Dict[str
     return via
 
 
-def _effective_via6(node: Dict[str, Any], iface: Dict[str, Any], route: Dict[str, Any]) -> str | None:
+def _effective_via6(
+    iface: Mapping[str, Any],
+    route: Mapping[str, Any],
+    local6: set[str],
+) -> str | None:
     via = _via6(route)
-    _, local6 = _local_ips(node)
 
     if via in local6:
         via = None
@@ -335,7 +348,7 @@ def _effective_via6(node: Dict[str, Any], iface: Dict[str, Any], route: Dict[str
     return via
 
 
-def _render_interfaces(node: Dict[str, Any], eth_map: Dict[str, int]) -> List[str]:
+def _render_interfaces(node: Mapping[str, Any], eth_map: Dict[str, int]) -> List[str]:
     cmds: List[str] = []
     interfaces = node.get("interfaces", {})
 
@@ -356,7 +369,7 @@ def _render_interfaces(node: Dict[str, Any], eth_map: Dict[str, int]) -> List[st
     return cmds
 
 
-def _render_addressing(node: Dict[str, Any], eth_map: Dict[str, int]) -> List[str]:
+def _render_addressing(node: Mapping[str, Any], eth_map: Dict[str, int]) -> List[str]:
     cmds: List[str] = []
 
     for ifname in sorted((node.get("interfaces", {}) or {}).keys()):
@@ -400,8 +413,9 @@ def _render_addressing(node: Dict[str, Any], eth_map: Dict[str, int]) -> List[st
     return cmds
 
 
-def _render_static_routes(node: Dict[str, Any], eth_map: Dict[str, int]) -> List[str]:
+def _render_static_routes(node: Mapping[str, Any], eth_map: Dict[str, int]) -> List[str]:
     cmds: List[str] = []
+    trusted = bool(node.get("trusted"))
     seen: set[str] = set()
     connected4, connected6 = _connected_prefixes(node)
     local4, local6 = _local_ips(node)
@@ -412,11 +426,11 @@ def _render_static_routes(node: Dict[str, Any], eth_map: Dict[str, int]) -> List
         if eth is None:
             continue
 
-        routes = _route_lists(iface)
+        routes = _route_lists(iface, trusted)
 
-        for r in routes["ipv4"]:
+        for r in routes.get("ipv4", ()):
             dst = _dst(r)
-            via = _effective_via4(node, iface, r)
+            via = _effective_via4(iface, r, local4)
 
             if not dst or not via or dst == "0.0.0.0/0":
                 continue
@@ -434,9 +448,9 @@ def _render_static_routes(node: Dict[str, Any], eth_map: Dict[str, int]) -> List
                 seen.add(cmd)
                 cmds.append(cmd)
 
-        for r in routes["ipv6"]:
+        for r in routes.get("ipv6", ()):
             dst = _dst(r)
-            via = _effective_via6(node, iface, r)
+            via = _effective_via6(iface, r, local6)
 
             if not dst or not via or dst == "::/0":
                 continue
@@ -457,8 +471,9 @@ def _render_static_routes(node: Dict[str, Any], eth_map: Dict[str, int]) -> List
     return cmds
 
 
-def _render_default_routes(node: Dict[str, Any], eth_map: Dict[str, int]) -> List[str]:
+def _render_default_routes(node: Mapping[str, Any], eth_map: Dict[str, int]) -> List[str]:
     cmds: List[str] = []
+    trusted = bool(node.get("trusted"))
     seen: set[str] = set()
     local4, local6 = _local_ips(node)
 
@@ -468,28 +483,28 @@ def _render_default_routes(node: Dict[str, Any], eth_map: Dict[str, int]) -> Lis
         if eth is None:
             continue
 
-        routes = _route_lists(iface)
+        routes = _route_lists(iface, trusted)
 
-        for r in routes["ipv4"]:
+        for r in routes.get("ipv4", ()):
             if _dst(r) != "0.0.0.0/0":
                 continue
             if _route_via_is_local(r, 4, local4, local6):
                 continue
 
-            via = _effective_via4(node, iface, r)
+            via = _effective_via4(iface, r, local4)
             if via:
                 cmd = f"ip route replace default via {via} dev eth{eth} onlink"
                 if cmd not in seen:
                     seen.add(cmd)
                     cmds.append(cmd)
 
-        for r in routes["ipv6"]:
+        for r in routes.get("ipv6", ()):
             if _dst(r) != "::/0":
                 continue
             if _route_via_is_local(r, 6, local4, local6):
                 continue
 
-            via = _effective_via6(node, iface, r)
+            via = _effective_via6(iface, r, local6)
             if via:
                 cmd = f"ip -6 route replace default via {via} dev eth{eth} onlink"
                 if cmd not in seen:
@@ -502,21 +517,24 @@ def _render_default_routes(node: Dict[str, Any], eth_map: Dict[str, int]) -> Lis
 def render(
     role: str,
     node_name: str,
-    node_data: Dict[str, Any],
+    node_data: Mapping[str, Any],
     eth_map: Dict[str, int],
+    cm_inputs: Dict[str, Any] | None = None,
 ) -> List[str]:
     cmds: List[str] = [
         "sh -c 'for i in /proc/sys/net/ipv4/conf/*/rp_filter; do echo 0 > \"$i\"; done'",
     ]
 
     cmds.extend(_render_interfaces(node_data, eth_map))
-    cmds.extend(_render_addressing(node_data, eth_map))
 
-    if role != "wan-peer":
+    if role != "internet":
+        cmds.extend(_render_addressing(node_data, eth_map))
+
+    if role not in {"wan-peer", "internet"}:
         cmds.extend(_render_static_routes(node_data, eth_map))
         cmds.extend(_render_default_routes(node_data, eth_map))
 
     _ = node_name
-    cmds.extend(render_cm(role, node_data.get("_cm_inputs", {})))
+    cmds.extend(render_cm(role, cm_inputs or {}))
 
     return cmds
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Dict, Any, List, Tuple
+from typing import Any, Dict, List, Mapping, Tuple
 
 
 def _sorted_ifaces(eth_map: Dict[str, int]) -> List[Tuple[str, int]]:
@@ -29,7 +29,7 @@ def _links(items: List[Tuple[str, int]]) -> List[Dict[str, Any]]:
 
 def parse_access(
     node_name: str,
-    node_data: Dict[str, Any],
+    node_data: Mapping[str, Any],
     eth_map: Dict[str, int],
 ) -> Dict[str, Any]:
     _ = node_data
@@ -48,7 +48,7 @@ def parse_access(
 
 def parse_core(
     node_name: str,
-    node_data: Dict[str, Any],
+    node_data: Mapping[str, Any],
     eth_map: Dict[str, int],
 ) -> Dict[str, Any]:
     _ = node_data
@@ -67,7 +67,7 @@ def parse_core(
 
 def parse_wan_peer(
     node_name: str,
-    node_data: Dict[str, Any],
+    node_data: Mapping[str, Any],
     eth_map: Dict[str, int],
 ) -> Dict[str, Any]:
     _ = node_data
@@ -85,7 +85,7 @@ def parse_wan_peer(
 
 def parse_upstream_selector(
     node_name: str,
-    node_data: Dict[str, Any],
+    node_data: Mapping[str, Any],
     eth_map: Dict[str, int],
 ) -> Dict[str, Any]:
     _ = node_data
@@ -104,7 +104,7 @@ def parse_upstream_selector(
 
 def parse_policy(
     node_name: str,
-    node_data: Dict[str, Any],
+    node_data: Mapping[str, Any],
     eth_map: Dict[str, int],
 ) -> Dict[str, Any]:
     _ = node_data
@@ -1,3 +1,3 @@
-from .base import render_units
+from .base import build_eth_maps, render_units
 
-__all__ = ["render_units"]
+__all__ = ["build_eth_maps", "render_units"]
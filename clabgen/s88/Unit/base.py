@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Dict, List, Tuple, Any, Callable
+from typing import Dict, List, Tuple, Any, Callable, Set
 import hashlib
 import ipaddress
 
@@ -8,6 +8,7 @@ from clabgen.models import SiteModel, NodeModel
 from clabgen.s88.Unit.access import render as render_access
 from clabgen.s88.Unit.client import render as render_client
 from clabgen.s88.Unit.core import render as render_core
+from clabgen.s88.Unit.internet import render as render_internet
 from clabgen.s88.Unit.policy import render as render_policy
 from clabgen.s88.Unit.upstream_selector import render as render_upstream_selector
 from clabgen.s88.Unit.wan_peer import render as render_wan_peer
@@ -17,6 +18,8 @@ NodeRenderer = Callable[[SiteModel, str, NodeModel, Dict[str, int], Dict[str, An
 
 MAX_BRIDGE_NAME = 15
 
+LINK_MODES = ("bridge", "veth")
+
 
 def _bridge_name(seed: str) -> str:
     h = hashlib.blake2s(seed.encode(), digest_size=6).hexdigest()
@@ -50,9 +53,8 @@ def _tenant_group_key(iface_name: str, node_name: str, iface: Any) -> str:
     )
 
 
-def _build_eth_maps(site: SiteModel) -> Dict[str, Dict[str, int]]:
-    eth_maps: Dict[str, Dict[str, int]] = {n: {} for n in site.nodes}
-    counters: Dict[str, int] = {n: 1 for n in site.nodes}
+def _needed_ifaces(site: SiteModel) -> Dict[str, List[str]]:
+    needed: Dict[str, List[str]] = {n: [] for n in site.nodes}
 
     for link_name in sorted(site.links.keys()):
         link = site.links[link_name]
@@ -65,17 +67,47 @@ def _build_eth_maps(site: SiteModel) -> Dict[str, Dict[str, int]]:
             if iface is None:
                 continue
 
-            if iface not in eth_maps[node_name]:
-                eth_maps[node_name][iface] = counters[node_name]
-                counters[node_name] += 1
+            if iface not in needed[node_name]:
+                needed[node_name].append(iface)
 
     for node_name in sorted(site.nodes.keys()):
         node = site.nodes[node_name]
         for ifname in sorted(node.interfaces.keys()):
             iface = node.interfaces[ifname]
-            if iface.kind == "tenant" and ifname not in eth_maps[node_name]:
-                eth_maps[node_name][ifname] = counters[node_name]
-                counters[node_name] += 1
+            if iface.kind == "tenant" and ifname not in needed[node_name]:
+                needed[node_name].append(ifname)
+
+    return needed
+
+
+def build_eth_maps(
+    site: SiteModel,
+    allocations: Dict[str, Dict[str, int]] | None = None,
+) -> Dict[str, Dict[str, int]]:
+    allocations = allocations or {}
+    eth_maps: Dict[str, Dict[str, int]] = {}
+
+    for node_name, ifaces in _needed_ifaces(site).items():
+        previous = allocations.get(node_name, {}) or {}
+        eth_map: Dict[str, int] = {}
+        used = set()
+
+        for iface in ifaces:
+            eth = previous.get(iface)
+            if isinstance(eth, int) and eth >= 1 and eth not in used:
+                eth_map[iface] = eth
+                used.add(eth)
+
+        counter = 1
+        for iface in ifaces:
+            if iface in eth_map:
+                continue
+            while counter in used:
+                counter += 1
+            eth_map[iface] = counter
+            used.add(counter)
+
+        eth_maps[node_name] = {iface: eth_map[iface] for iface in ifaces}
 
     return eth_maps
 
@@ -85,6 +117,7 @@ def _renderers() -> Dict[str, NodeRenderer]:
         "access": render_access,
         "client": render_client,
         "core": render_core,
+        "internet": render_internet,
         "policy": render_policy,
         "upstream-selector": render_upstream_selector,
         "wan-peer": render_wan_peer,
@@ -109,14 +142,25 @@ def _render_node(
     return renderer(site, node_name, node, eth_map, _node_extra(site))
 
 
-def render_units(site: SiteModel) -> Tuple[Dict[str, Any], List[Dict[str, Any]], List[str]]:
-    eth_maps = _build_eth_maps(site)
+def render_units(
+    site: SiteModel,
+    eth_maps: Dict[str, Dict[str, int]] | None = None,
+    link_mode: str = "bridge",
+    only_nodes: Set[str] | None = None,
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]], List[str]]:
+    if link_mode not in LINK_MODES:
+        raise ValueError(f"unknown link mode {link_mode!r}")
+
+    if eth_maps is None:
+        eth_maps = build_eth_maps(site)
 
     nodes: Dict[str, Any] = {}
     links: List[Dict[str, Any]] = []
     bridges: List[str] = []
 
     for node_name in sorted(site.nodes.keys()):
+        if only_nodes is not None and node_name not in only_nodes:
+            continue
         node = site.nodes[node_name]
         nodes[node_name] = _render_node(site, node_name, node, eth_maps.get(node_name, {}))
 
@@ -140,6 +184,10 @@ def render_units(site: SiteModel) -> Tuple[Dict[str, Any], List[Dict[str, Any]],
             endpoints.append(endpoint)
 
 
+        if len(endpoints) == 2 and link_mode == "veth":
+            links.append({"endpoints": endpoints})
+            continue
+
         if len(endpoints) == 2:
             bridge = _bridge_name(f"{site.enterprise}-{site.site}-{link_name}")
             bridges.append(bridge)
@@ -171,10 +219,15 @@ def render_units(site: SiteModel) -> Tuple[Dict[str, Any], List[Dict[str, Any]],
             tenant_groups.setdefault(tenant_key, []).append(endpoint)
 
     for tenant in sorted(tenant_groups.keys()):
+        endpoints = list(tenant_groups[tenant])
+
+        if len(endpoints) == 2 and link_mode == "veth":
+            links.append({"endpoints": endpoints})
+            continue
+
         bridge = _bridge_name(f"{site.enterprise}-{site.site}-tenant-{tenant}")
         bridges.append(bridge)
 
-        endpoints = list(tenant_groups[tenant])
         if len(endpoints) == 1:
             host_endpoint = f"host:{_host_ifname(bridge)}"
             endpoints.append(host_endpoint)
@@ -189,4 +242,19 @@ def render_units(site: SiteModel) -> Tuple[Dict[str, Any], List[Dict[str, Any]],
             }
         )
 
+    if only_nodes is not None:
+        links = [
+            link
+            for link in links
+            if all(
+                ep.split(":", 1)[0] in nodes or ep.startswith("host:")
+                for ep in link["endpoints"]
+            )
+        ]
+        bridges = [
+            link["labels"]["clab.link.bridge"]
+            for link in links
+            if "labels" in link
+        ]
+
     return nodes, links, sorted(set(bridges))
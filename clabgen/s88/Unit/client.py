@@ -3,7 +3,24 @@ from __future__ import annotations
 from typing import Dict, Any
 
 from clabgen.models import NodeModel, SiteModel
-from clabgen.s88.Unit.common import render_linux_node
+from clabgen.s88.Unit.common import CLIENT_IMAGE, ROUTER_IMAGE, render_linux_node
+
+
+def _client_namespaces(node: NodeModel, eth_map: Dict[str, int]) -> Dict[str, Any]:
+    module = node.control_modules.get("client_namespaces")
+    if module is None:
+        return {}
+
+    parents = [ifname for ifname in sorted(node.interfaces.keys()) if ifname in eth_map]
+    if not parents:
+        return {}
+
+    return {
+        "client_namespaces": {
+            "parent": f"eth{eth_map[parents[0]]}",
+            "namespaces": list(module.spec.get("namespaces", [])),
+        }
+    }
 
 
 def render(
@@ -14,9 +31,15 @@ def render(
     extra: Dict[str, Any],
 ) -> Dict[str, Any]:
     _ = site
+    namespaces = _client_namespaces(node, eth_map)
+    merged_extra = dict(extra)
+    merged_extra.update(namespaces)
+
+    # Namespace clients only need iproute2, not the FRR tooling image.
     return render_linux_node(
         node_name=node_name,
         node=node,
         eth_map=eth_map,
-        extra=extra,
+        extra=merged_extra,
+        image=CLIENT_IMAGE if namespaces else ROUTER_IMAGE,
     )
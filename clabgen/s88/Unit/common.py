@@ -1,43 +1,57 @@
 from __future__ import annotations
 
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Any, Dict, Mapping
 
-import copy
-
-from clabgen.models import NodeModel
+from clabgen.models import InterfaceModel, NodeModel
 from clabgen.s88.engine import render_node_s88
 
 
+ROUTER_IMAGE = "clab-frr-plus-tooling:latest"
+CLIENT_IMAGE = "clab-client:latest"
+
+
+def _interface_view(iface: InterfaceModel) -> Mapping[str, Any]:
+    # Route tuples are shared with the site model, never copied.
+    return MappingProxyType(
+        {
+            "addr4": iface.addr4,
+            "addr6": iface.addr6,
+            "ll6": iface.ll6,
+            "kind": iface.kind,
+            "tenant": iface.tenant,
+            "overlay": iface.overlay,
+            "upstream": iface.upstream,
+            "routes": MappingProxyType(iface.routes),
+        }
+    )
+
+
 def build_node_data(
     node_name: str,
     node: NodeModel,
     eth_map: Dict[str, int],
     extra: Dict[str, Any] | None = None,
-) -> Dict[str, Any]:
+) -> Mapping[str, Any]:
     node_data: Dict[str, Any] = {
         "name": node_name,
         "role": node.role,
-        "interfaces": {
-            ifname: {
-                "addr4": iface.addr4,
-                "addr6": iface.addr6,
-                "ll6": iface.ll6,
-                "kind": iface.kind,
-                "tenant": iface.tenant,
-                "overlay": iface.overlay,
-                "upstream": iface.upstream,
-                "routes": copy.deepcopy(iface.routes),
+        "interfaces": MappingProxyType(
+            {
+                ifname: _interface_view(iface)
+                for ifname, iface in sorted(node.interfaces.items())
+                if ifname in eth_map
             }
-            for ifname, iface in sorted(node.interfaces.items())
-            if ifname in eth_map
-        },
-        "route_intents": list(node.route_intents),
+        ),
+        "route_intents": tuple(node.route_intents),
+        # Routes on site models were checked by the document validator.
+        "trusted": True,
     }
 
     if extra:
-        node_data.update(copy.deepcopy(extra))
+        node_data.update(extra)
 
-    return node_data
+    return MappingProxyType(node_data)
 
 
 def render_linux_node(
@@ -45,12 +59,13 @@ def render_linux_node(
     node: NodeModel,
     eth_map: Dict[str, int],
     extra: Dict[str, Any] | None = None,
+    image: str = ROUTER_IMAGE,
 ) -> Dict[str, Any]:
     node_data = build_node_data(node_name, node, eth_map, extra=extra)
     exec_cmds = render_node_s88(node_name, node_data, eth_map)
 
     return {
         "kind": "linux",
-        "image": "clab-frr-plus-tooling:latest",
+        "image": image,
         "exec": exec_cmds,
     }
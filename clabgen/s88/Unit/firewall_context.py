@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from dataclasses import asdict
 from typing import Any, Dict, List, Set, Tuple
 import json
 import re
@@ -94,7 +95,7 @@ def _policy_peer_map(site: SiteModel, policy_node_name: str, eth_map: Dict[str,
         if len(peers) != 1:
             raise RuntimeError(
                 "policy link must have exactly one peer\n"
-                + json.dumps(link.__dict__, indent=2, default=str)
+                + json.dumps(asdict(link), indent=2, default=str)
             )
 
         results.append(
@@ -189,7 +190,7 @@ def _access_node_tenants(site: SiteModel, node: NodeModel) -> List[str]:
         "role": node.role,
         "candidate_tenants": candidate_tenants,
         "interfaces": {
-            name: getattr(iface, "__dict__", str(iface))
+            name: asdict(iface)
             for name, iface in node.interfaces.items()
         },
     }
@@ -201,7 +202,7 @@ def _access_node_tenants(site: SiteModel, node: NodeModel) -> List[str]:
 
 
 def _domains_external_names(site: SiteModel) -> Set[str]:
-    domains = dict(site.raw_domains or site.domains or {})
+    domains = dict(site.domains or {})
     externals = domains.get("externals", [])
 
     if isinstance(externals, dict):
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from typing import Dict, Any, List
+
+from clabgen.models import NodeModel, SiteModel
+from clabgen.s88.Unit.common import render_linux_node
+
+
+def _uplinks(node: NodeModel, eth_map: Dict[str, int]) -> List[Dict[str, Any]]:
+    uplinks: List[Dict[str, Any]] = []
+
+    for ifname, eth in sorted(eth_map.items(), key=lambda x: x[1]):
+        iface = node.interfaces.get(ifname)
+        if iface is None:
+            continue
+
+        uplinks.append(
+            {
+                "eth": f"eth{eth}",
+                "addr4": iface.addr4,
+                "addr6": iface.addr6,
+            }
+        )
+
+    return uplinks
+
+
+def render(
+    site: SiteModel,
+    node_name: str,
+    node: NodeModel,
+    eth_map: Dict[str, int],
+    extra: Dict[str, Any],
+) -> Dict[str, Any]:
+    _ = site
+    merged_extra = dict(extra)
+    merged_extra["uplink_namespaces"] = {
+        "uplinks": _uplinks(node, eth_map),
+    }
+
+    return render_linux_node(
+        node_name=node_name,
+        node=node,
+        eth_map=eth_map,
+        extra=merged_extra,
+    )
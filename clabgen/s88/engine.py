@@ -1,14 +1,14 @@
 # ./clabgen/s88/engine.py
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Mapping
 
 from clabgen.s88.EM.base import render as render_em
 
 
 def render_node_s88(
     node_name: str,
-    node_data: Dict[str, Any],
+    node_data: Mapping[str, Any],
     eth_map: Dict[str, int],
     routing_mode: str = "static",
     disable_dynamic: bool = True,
@@ -1,20 +1,29 @@
 # ./clabgen/s88/enterprise/enterprise.py
 from __future__ import annotations
 
-from typing import Dict, Any, List
+from collections import OrderedDict
+from typing import Any, Collection, Dict, Iterable, List, Set, Tuple
 from pathlib import Path
 import copy
+import dataclasses
 import hashlib
+import json
+import threading
 
-from clabgen.models import SiteModel
-from clabgen.s88.enterprise.site_loader import load_sites
-from clabgen.s88.enterprise.inject_wan_peers import inject_emulated_wan_peers
-from clabgen.s88.enterprise.inject_clients import inject_clients
-from clabgen.s88.Unit.base import render_units
+from clabgen.models import InterfaceModel, NodeModel, RenderOptions, SiteModel
+from clabgen.s88.enterprise.site_loader import load_sites, load_sites_from_document
+from clabgen.s88.enterprise.inject_wan_peers import INTERNET_NODE, inject_emulated_wan_peers
+from clabgen.s88.enterprise.inject_clients import check_inventory_hosts, inject_clients
+from clabgen.s88.enterprise.groups import assign_groups
+from clabgen.s88.enterprise.vlan_bridge import VLAN_BRIDGE, assign_vlans
+from clabgen.s88.Unit.base import build_eth_maps, render_units
+from clabgen.s88.Unit.internet import render as render_internet
 
 
 MAX_NODE_NAME = 64
 
+BRIDGE_MODES = ("per-segment", "vlan")
+
 
 def _hash5(value: str) -> str:
     return hashlib.blake2s(value.encode(), digest_size=3).hexdigest()[:5]
@@ -48,9 +57,10 @@ def _tail_tokens(value: str, max_len: int) -> str:
 
 
 def _scoped_node_name(site: SiteModel, node_name: str) -> str:
-    enterprise = site.enterprise
-    site_name = site.site
+    return _scoped_name(site.enterprise, site.site, node_name)
+
 
+def _scoped_name(enterprise: str, site_name: str, node_name: str) -> str:
     candidates = [
         f"{enterprise}-{site_name}-{node_name}",
         f"{_hash5(enterprise)}-{site_name}-{node_name}",
@@ -76,15 +86,72 @@ def _scoped_node_name(site: SiteModel, node_name: str) -> str:
     return candidate[:MAX_NODE_NAME]
 
 
-def generate_topology(site: SiteModel) -> Dict[str, Any]:
+def _node_selected(site: SiteModel, node_name: str, names: Collection[str]) -> bool:
+    if node_name in names or _scoped_node_name(site, node_name) in names:
+        return True
+    return node_name == INTERNET_NODE and _enterprise_internet_name(site.enterprise) in names
+
+
+def site_selected(site_key: str, site_name: str, names: Collection[str]) -> bool:
+    return site_key in names or site_name in names
+
+
+def select_site_keys(
+    candidates: Iterable[Tuple[str, str, str, Iterable[str]]],
+    sites: Collection[str] | None = None,
+    nodes: Collection[str] | None = None,
+) -> List[str] | None:
+    if not sites and not nodes:
+        return None
+
+    wanted = set(nodes or ())
+    in_scope: List[Tuple[str, bool]] = []
+    matched: Set[str] = set()
+
+    for site_key, enterprise, site_name, node_names in candidates:
+        if sites and not site_selected(site_key, site_name, sites):
+            continue
+
+        hits: Set[str] = set()
+        for node_name in node_names:
+            hits |= {node_name, _scoped_name(enterprise, site_name, node_name)} & wanted
+
+        matched |= hits
+        in_scope.append((site_key, bool(hits)))
+
+    if not wanted <= matched:
+        # Injected WAN peers, clients and the enterprise internet node only
+        # exist after rendering, so any site in scope may hold them.
+        return [site_key for site_key, _ in in_scope]
+
+    return [site_key for site_key, hit in in_scope if hit or not wanted]
+
+
+def generate_topology(
+    site: SiteModel,
+    options: RenderOptions | None = None,
+    allocations: Dict[str, Dict[str, int]] | None = None,
+    node_names: Collection[str] | None = None,
+) -> Dict[str, Any]:
+    options = options or RenderOptions()
     site = copy.deepcopy(site)
 
-    inject_emulated_wan_peers(site)
-    inject_clients(site)
+    inject_emulated_wan_peers(site, mode=options.wan_peer_mode)
+    inject_clients(site, mode=options.client_mode)
+
+    only_nodes = None
+    if node_names is not None:
+        only_nodes = {n for n in site.nodes if _node_selected(site, n, node_names)}
 
-    nodes, links, bridges = render_units(site)
+    eth_maps = build_eth_maps(site, allocations)
+    nodes, links, bridges = render_units(
+        site,
+        eth_maps=eth_maps,
+        link_mode=options.link_mode,
+        only_nodes=only_nodes,
+    )
 
-    return {
+    topology = {
         "name": f"{site.enterprise}-{site.site}",
         "topology": {
             "defaults": {
@@ -97,12 +164,135 @@ def generate_topology(site: SiteModel) -> Dict[str, Any]:
         "bridges": bridges,
         "bridge_control_modules": {},
         "solver_meta": dict(site.solver_meta or {}),
+        "node_roles": {
+            node_name: str(site.nodes[node_name].role or "")
+            for node_name in nodes
+        },
+        "eth_maps": {
+            node_name: dict(eth_maps.get(node_name, {}))
+            for node_name in nodes
+        },
     }
 
+    if options.wan_peer_mode == "enterprise" and INTERNET_NODE in nodes:
+        nodes.pop(INTERNET_NODE, None)
+        topology["eth_maps"].pop(INTERNET_NODE, None)
+        topology["internet"] = {
+            "node": site.nodes[INTERNET_NODE],
+            "eth_map": dict(eth_maps.get(INTERNET_NODE, {})),
+        }
+
+    return topology
+
+
+def _enterprise_internet_name(enterprise: str) -> str:
+    name = f"{enterprise}-{INTERNET_NODE}"
+    if len(name) <= MAX_NODE_NAME:
+        return name
+    return f"{_hash5(enterprise)}-{INTERNET_NODE}"
+
+
+class _EnterpriseInternet:
+    def __init__(self, site: SiteModel) -> None:
+        self.site = site
+        self.name = _enterprise_internet_name(site.enterprise)
+        self.interfaces: Dict[str, InterfaceModel] = {}
+        self.eth_map: Dict[str, int] = {}
+
+    def attach(self, site_key: str, internet: Dict[str, Any]) -> int:
+        base = max(self.eth_map.values(), default=0)
+        node: NodeModel = internet["node"]
+
+        for ifname, eth in internet["eth_map"].items():
+            scoped_ifname = f"{site_key}:{ifname}"
+            self.interfaces[scoped_ifname] = node.interfaces[ifname]
+            self.eth_map[scoped_ifname] = base + eth
+
+        return base
+
+    def render(self) -> Dict[str, Any]:
+        node = NodeModel(
+            name=self.name,
+            role="internet",
+            routing_domain="",
+            interfaces=self.interfaces,
+        )
+        return render_internet(self.site, self.name, node, self.eth_map, {})
+
+
+def _topology_cache_key(
+    digest: str,
+    options: RenderOptions,
+    allocations: Dict[str, Dict[str, int]] | None,
+) -> str:
+    return json.dumps(
+        [digest, dataclasses.asdict(options), allocations or {}],
+        sort_keys=True,
+    )
+
+
+class TopologyCache:
+    def __init__(self, max_entries: int = 512) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Dict[str, Any] | None:
+        with self._lock:
+            topo = self._entries.get(key)
+            if topo is not None:
+                self._entries.move_to_end(key)
+            return topo
+
+    def put(self, keys: List[str], topo: Dict[str, Any]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries[key] = topo
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
 
 class Enterprise:
-    def __init__(self, sites: Dict[str, SiteModel]) -> None:
+    def __init__(
+        self,
+        sites: Dict[str, SiteModel],
+        site_digests: Dict[str, str] | None = None,
+        topology_cache: TopologyCache | None = None,
+    ) -> None:
         self.sites = sites
+        self.site_digests = dict(site_digests or {})
+        self.topology_cache = topology_cache or TopologyCache()
+        self.rendered_sites: List[str] = []
+
+    def _site_topology(
+        self,
+        site_key: str,
+        options: RenderOptions,
+        allocations: Dict[str, Dict[str, int]] | None,
+        node_names: Collection[str] | None = None,
+    ) -> Dict[str, Any]:
+        site = self.sites[site_key]
+        digest = self.site_digests.get(site_key)
+
+        if digest is None or node_names is not None:
+            self.rendered_sites.append(site_key)
+            return generate_topology(site, options, allocations, node_names)
+
+        cache_key = _topology_cache_key(digest, options, allocations)
+        cached = self.topology_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        self.rendered_sites.append(site_key)
+        topo = generate_topology(site, options, allocations)
+
+        persisted = {**(allocations or {}), **topo["eth_maps"]}
+        self.topology_cache.put(
+            [cache_key, _topology_cache_key(digest, options, persisted)],
+            topo,
+        )
+        return topo
 
     @classmethod
     def from_solver_json(
@@ -116,25 +306,77 @@ class Enterprise:
         )
         return cls(sites)
 
-    def render(self) -> Dict[str, Any]:
+    @classmethod
+    def from_document(
+        cls,
+        document: Dict[str, Any],
+        renderer_inventory: Dict[str, Any] | None = None,
+    ) -> "Enterprise":
+        sites = load_sites_from_document(
+            document,
+            renderer_inventory=renderer_inventory,
+        )
+        return cls(sites)
+
+    def render(
+        self,
+        options: RenderOptions | None = None,
+        eth_allocations: Dict[str, Dict[str, Dict[str, int]]] | None = None,
+        sites: Collection[str] | None = None,
+        nodes: Collection[str] | None = None,
+    ) -> Dict[str, Any]:
+        options = options or RenderOptions()
+        eth_allocations = eth_allocations or {}
+        if options.bridge_mode not in BRIDGE_MODES:
+            raise ValueError(f"unknown bridge mode {options.bridge_mode!r}")
+
+        site_keys = [
+            site_key
+            for site_key in sorted(self.sites.keys())
+            if not sites or site_selected(site_key, self.sites[site_key].site, sites)
+        ]
+        if sites and not site_keys:
+            raise ValueError(f"no site matches {', '.join(sorted(sites))}")
+        if options.client_mode == "namespace":
+            check_inventory_hosts(self.sites.values())
+        node_names = set(nodes) if nodes else None
+
         merged_nodes: Dict[str, Any] = {}
         merged_links: List[Dict[str, Any]] = []
         merged_bridges: List[str] = []
 
         defaults: Dict[str, Any] | None = None
         solver_meta: Dict[str, Any] | None = None
+        internets: Dict[str, _EnterpriseInternet] = {}
+        node_meta: Dict[str, Dict[str, str]] = {}
+        merged_eth_maps: Dict[str, Dict[str, Dict[str, int]]] = {}
+        self.rendered_sites = []
 
-        for site_key in sorted(self.sites.keys()):
+        for site_key in site_keys:
             site = self.sites[site_key]
-            topo = generate_topology(site)
+            topo = self._site_topology(
+                site_key,
+                options,
+                eth_allocations.get(site_key),
+                node_names,
+            )
+            merged_eth_maps[site_key] = topo["eth_maps"]
 
             if defaults is None:
-                defaults = topo["topology"]["defaults"]
+                defaults = dict(topo["topology"]["defaults"])
 
             if solver_meta is None:
                 solver_meta = dict(topo.get("solver_meta", {}) or {})
 
             node_name_map: Dict[str, str] = {}
+            internet_base: int | None = None
+
+            if "internet" in topo:
+                internet = internets.get(site.enterprise)
+                if internet is None:
+                    internet = internets[site.enterprise] = _EnterpriseInternet(site)
+                internet_base = internet.attach(site_key, topo["internet"])
+                node_name_map[INTERNET_NODE] = internet.name
 
             for node_name in sorted(topo["topology"]["nodes"].keys()):
                 rendered_node_name = _scoped_node_name(site, node_name)
@@ -143,6 +385,10 @@ class Enterprise:
                     raise ValueError(f"duplicate rendered node '{rendered_node_name}'")
 
                 node_name_map[node_name] = rendered_node_name
+                node_meta[rendered_node_name] = {
+                    "site": site_key,
+                    "role": topo["node_roles"].get(node_name, ""),
+                }
                 merged_nodes[rendered_node_name] = copy.deepcopy(
                     topo["topology"]["nodes"][node_name]
                 )
@@ -164,6 +410,11 @@ class Enterprise:
                         rewritten_endpoints.append(endpoint)
                         continue
 
+                    if endpoint_node_name == INTERNET_NODE and internet_base is not None:
+                        eth = internet_base + int(ifname.removeprefix("eth"))
+                        rewritten_endpoints.append(f"{node_name_map[INTERNET_NODE]}:eth{eth}")
+                        continue
+
                     rendered_node_name = node_name_map.get(endpoint_node_name)
                     if rendered_node_name is None:
                         raise ValueError(
@@ -179,7 +430,17 @@ class Enterprise:
 
             merged_bridges.extend(list(topo.get("bridges", [])))
 
-        return {
+        for enterprise_name in sorted(internets.keys()):
+            internet = internets[enterprise_name]
+            if internet.name in merged_nodes:
+                raise ValueError(f"duplicate rendered node '{internet.name}'")
+            merged_nodes[internet.name] = internet.render()
+            node_meta[internet.name] = {"site": "", "role": "internet"}
+
+        if node_names is not None and not merged_nodes:
+            raise ValueError(f"no node matches {', '.join(sorted(node_names))}")
+
+        rendered: Dict[str, Any] = {
             "name": "fabric",
             "topology": {
                 "defaults": defaults or {},
@@ -189,4 +450,23 @@ class Enterprise:
             "bridges": sorted(set(merged_bridges)),
             "bridge_control_modules": {},
             "solver_meta": solver_meta or {},
+            "node_meta": node_meta,
+            "eth_maps": merged_eth_maps,
         }
+
+        if options.groups:
+            groups, preambles = assign_groups(merged_nodes, node_meta, defaults)
+            if groups:
+                rendered["topology"]["groups"] = groups
+            if preambles:
+                rendered["preambles"] = preambles
+
+        if options.bridge_mode == "vlan":
+            vlans, host_ports, container_ports = assign_vlans(merged_links)
+            rendered["bridges"] = [VLAN_BRIDGE] if vlans else []
+            rendered["vlan_bridge"] = VLAN_BRIDGE
+            rendered["vlans"] = vlans
+            rendered["vlan_host_ports"] = host_ports
+            rendered["vlan_ports"] = container_ports
+
+        return rendered
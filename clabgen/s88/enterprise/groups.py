@@ -0,0 +1,135 @@
+# ./clabgen/s88/enterprise/groups.py
+from __future__ import annotations
+
+from typing import Any, Dict, List, Tuple
+import hashlib
+import re
+
+
+PINNED_KEYS = ("kind", "image")
+
+# Host directory (relative to the topology file) holding the per-role
+# preamble scripts, and where the group binds mount them in the node.
+PREAMBLE_DIR = "clab-preamble"
+PREAMBLE_MOUNT = "/clabgen"
+
+STATIC_IFACES = ("all", "default", "lo", "eth0")
+
+_SYSCTL_IFACE = re.compile(r"\.conf\.([^.=\s]+)\.")
+
+
+def _family(cmd: str) -> str | None:
+    if cmd.startswith("sh -c 'for i in /proc/sys/"):
+        return "sysctl"
+
+    if cmd.startswith("sysctl "):
+        match = _SYSCTL_IFACE.search(cmd)
+        if match is None or match.group(1) in STATIC_IFACES:
+            return "sysctl"
+        return None
+
+    if cmd.startswith("nft ") and not cmd.startswith("nft list"):
+        return "nft"
+
+    return None
+
+
+def _common_prefix(sequences: List[List[str]]) -> List[str]:
+    if not sequences:
+        return []
+
+    prefix: List[str] = []
+    for items in zip(*sequences):
+        if any(item != items[0] for item in items[1:]):
+            break
+        prefix.append(items[0])
+    return prefix
+
+
+def _hoist(execs: List[List[str]], family: str) -> List[str]:
+    return _common_prefix([[cmd for cmd in ex if _family(cmd) == family] for ex in execs])
+
+
+def _without(exec_cmds: List[str], hoisted: Dict[str, List[str]]) -> List[str]:
+    remaining = {family: len(cmds) for family, cmds in hoisted.items()}
+    result: List[str] = []
+
+    for cmd in exec_cmds:
+        family = _family(cmd)
+        if family is not None and remaining.get(family, 0) > 0:
+            remaining[family] -= 1
+            continue
+        result.append(cmd)
+
+    return result
+
+
+def preamble_script(commands: List[str]) -> str:
+    return "#!/bin/sh\n" + "\n".join(commands) + "\n"
+
+
+def _preamble_name(role: str, commands: List[str]) -> str:
+    digest = hashlib.sha256(preamble_script(commands).encode()).hexdigest()[:12]
+    return f"{re.sub(r'[^A-Za-z0-9_.-]+', '-', role)}-{digest}.sh"
+
+
+def assign_groups(
+    nodes: Dict[str, Any],
+    node_meta: Dict[str, Dict[str, str]],
+    defaults: Dict[str, Any] | None = None,
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, List[str]]]:
+    defaults = defaults or {}
+    members: Dict[str, List[str]] = {}
+    for node_name in nodes:
+        role = (node_meta.get(node_name) or {}).get("role") or "default"
+        members.setdefault(role, []).append(node_name)
+
+    groups: Dict[str, Dict[str, Any]] = {}
+    preambles: Dict[str, List[str]] = {}
+
+    for role in sorted(members):
+        names = members[role]
+        group: Dict[str, Any] = {}
+
+        for key in PINNED_KEYS:
+            values = {str(nodes[n].get(key)) for n in names}
+            if len(values) == 1 and key in nodes[names[0]]:
+                value = nodes[names[0]][key]
+                if defaults.get(key) != value:
+                    group[key] = value
+
+        # containerlab takes the first non-empty exec of node, group, kind
+        # and defaults; lists are not concatenated. The shared prefix goes
+        # into a script bind-mounted through the group instead, and every
+        # node's own exec starts by running it.
+        execs = [list(nodes[n].get("exec", []) or []) for n in names]
+        hoisted = {family: _hoist(execs, family) for family in ("sysctl", "nft")}
+        prefix = hoisted["sysctl"] + hoisted["nft"]
+
+        call: str | None = None
+        if prefix:
+            script = _preamble_name(role, prefix)
+            call = f"sh {PREAMBLE_MOUNT}/{script}"
+            if len(names) > 1 and sum(len(cmd) for cmd in prefix) > len(call):
+                preambles[script] = prefix
+                group["binds"] = [f"{PREAMBLE_DIR}/{script}:{PREAMBLE_MOUNT}/{script}:ro"]
+            else:
+                call = None
+
+        if not group:
+            continue
+
+        for node_name, exec_cmds in zip(names, execs):
+            node = {"group": role}
+            node.update(
+                (key, value)
+                for key, value in nodes[node_name].items()
+                if key not in group or key == "exec"
+            )
+            if call is not None:
+                node["exec"] = [call, *_without(exec_cmds, hoisted)]
+            nodes[node_name] = node
+
+        groups[role] = group
+
+    return groups, preambles
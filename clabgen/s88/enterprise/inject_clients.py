@@ -1,8 +1,19 @@
 from __future__ import annotations
 
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
 import ipaddress
+import re
 
-from clabgen.models import SiteModel, NodeModel, InterfaceModel
+from clabgen.models import (
+    SiteModel,
+    NodeModel,
+    InterfaceModel,
+    ControlModuleModel,
+    route_table,
+)
+
+
+CLIENT_MODES = ("container", "namespace")
 
 
 def _first_usable(network: ipaddress._BaseNetwork) -> ipaddress._BaseAddress:
@@ -65,7 +76,7 @@ def _derive_client_iface(cidr: str) -> tuple[str, str]:
     return str(router_ip), f"{client_ip}/{network.prefixlen}"
 
 
-def inject_clients(site: SiteModel) -> None:
+def _client_candidates(site: SiteModel) -> Iterator[Tuple[str, NodeModel, str, InterfaceModel]]:
     for node_name, node in list(site.nodes.items()):
         if node.role != "access":
             continue
@@ -87,53 +98,291 @@ def inject_clients(site: SiteModel) -> None:
                 if not _network_has_distinct_client_address(network6):
                     continue
 
-            client_name = f"client-{node_name}-{ifname}"
-            if client_name in site.nodes:
-                continue
+            yield node_name, node, ifname, iface
+
+
+def _client_node(
+    client_name: str,
+    node: NodeModel,
+    ifname: str,
+    iface: InterfaceModel,
+) -> NodeModel:
+    router_v4: str | None = None
+    client_v4: str | None = None
+    router_v6: str | None = None
+    client_v6: str | None = None
+
+    routes4: List[Dict[str, Any]] = []
+    routes6: List[Dict[str, Any]] = []
+
+    if iface.addr4:
+        router_v4, client_v4 = _derive_client_iface(iface.addr4)
+        routes4.append(
+            {
+                "dst": "0.0.0.0/0",
+                "via4": router_v4,
+            }
+        )
+
+    if iface.addr6:
+        router_v6, client_v6 = _derive_client_iface(iface.addr6)
+        routes6.append(
+            {
+                "dst": "::/0",
+                "via6": router_v6,
+            }
+        )
+
+    return NodeModel(
+        name=client_name,
+        role="client",
+        routing_domain=node.routing_domain,
+        interfaces={
+            ifname: InterfaceModel(
+                name=ifname,
+                addr4=client_v4,
+                addr6=client_v6,
+                kind="tenant",
+                tenant=iface.tenant,
+                upstream=ifname,
+                routes=route_table(routes4, routes6),
+            )
+        },
+    )
 
-            router_v4: str | None = None
-            client_v4: str | None = None
-            router_v6: str | None = None
-            client_v6: str | None = None
 
-            routes = {
-                "ipv4": [],
-                "ipv6": [],
-            }
+def _segment_key(iface: InterfaceModel) -> str:
+    prefixes = [
+        str(ipaddress.ip_interface(addr).network)
+        for addr in (iface.addr4, iface.addr6)
+        if isinstance(addr, str) and addr
+    ]
+    return sorted(prefixes, key=lambda p: (":" in p, p))[0]
 
-            if iface.addr4:
-                router_v4, client_v4 = _derive_client_iface(iface.addr4)
-                routes["ipv4"].append(
-                    {
-                        "dst": "0.0.0.0/0",
-                        "via4": router_v4,
-                    }
-                )
 
-            if iface.addr6:
-                router_v6, client_v6 = _derive_client_iface(iface.addr6)
-                routes["ipv6"].append(
-                    {
-                        "dst": "::/0",
-                        "via6": router_v6,
-                    }
+def _namespace_name(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "-", value).strip("-") or "ns"
+
+
+def _host_addr(value: Any, router_cidr: str | None, host_name: str) -> str | None:
+    if not isinstance(value, str) or not value or not router_cidr:
+        return None
+
+    network = _normalize_router_iface(router_cidr).network
+
+    if "/" in value:
+        iface = ipaddress.ip_interface(value)
+    else:
+        iface = ipaddress.ip_interface(f"{value}/{network.prefixlen}")
+
+    if iface.ip not in network:
+        raise ValueError(
+            f"inventory host {host_name!r} address {value!r} is outside tenant prefix {network}"
+        )
+
+    return f"{iface.ip}/{network.prefixlen}"
+
+
+def _derived_namespace(node_name: str, ifname: str, iface: InterfaceModel) -> Dict[str, Any]:
+    namespace: Dict[str, Any] = {"name": _namespace_name(f"client-{node_name}-{ifname}")}
+
+    if iface.addr4:
+        namespace["gateway4"], namespace["addr4"] = _derive_client_iface(iface.addr4)
+    if iface.addr6:
+        namespace["gateway6"], namespace["addr6"] = _derive_client_iface(iface.addr6)
+
+    return namespace
+
+
+def _inventory_namespace(
+    host_name: str,
+    host: Dict[str, Any],
+    iface: InterfaceModel,
+) -> Dict[str, Any]:
+    namespace: Dict[str, Any] = {"name": _namespace_name(host_name)}
+
+    addr4 = _host_addr(host.get("ipv4"), iface.addr4, host_name)
+    addr6 = _host_addr(host.get("ipv6"), iface.addr6, host_name)
+
+    if addr4 and iface.addr4:
+        namespace["addr4"] = addr4
+        namespace["gateway4"] = str(_normalize_router_iface(iface.addr4).ip)
+    if addr6 and iface.addr6:
+        namespace["addr6"] = addr6
+        namespace["gateway6"] = str(_normalize_router_iface(iface.addr6).ip)
+
+    mac = host.get("mac")
+    if isinstance(mac, str) and mac:
+        namespace["mac"] = mac
+
+    return namespace
+
+
+def _inventory_hosts(site: SiteModel) -> List[Tuple[str, Dict[str, Any]]]:
+    hosts = (site.renderer_inventory or {}).get("hosts", {})
+    if not isinstance(hosts, dict):
+        raise ValueError("renderer-inputs.json 'hosts' must be an object")
+
+    return [
+        (host_name, host)
+        for host_name, host in sorted(hosts.items())
+        if isinstance(host, dict)
+    ]
+
+
+def _site_matches(host: Dict[str, Any], site: SiteModel) -> bool:
+    attach_site = host.get("attach_site")
+    if not isinstance(attach_site, str) or not attach_site:
+        return True
+    return attach_site in (site.site, f"{site.enterprise}-{site.site}")
+
+
+def _host_matches(
+    host: Dict[str, Any],
+    site: SiteModel,
+    node_name: str,
+    iface: InterfaceModel,
+) -> bool:
+    if host.get("attach_node") != node_name or not _site_matches(host, site):
+        return False
+
+    network = host.get("attach_network")
+    if isinstance(network, str) and network and iface.tenant:
+        return network == iface.tenant
+
+    return True
+
+
+def check_inventory_hosts(sites: Iterable[SiteModel]) -> None:
+    attached: Dict[str, List[str]] = {}
+    nodes: Dict[str, Any] = {}
+
+    for site in sites:
+        for host_name, host in _inventory_hosts(site):
+            if host.get("attach_node") in site.nodes and _site_matches(host, site):
+                attached.setdefault(host_name, []).append(f"{site.enterprise}-{site.site}")
+                nodes[host_name] = host.get("attach_node")
+
+    for host_name, site_keys in sorted(attached.items()):
+        if len(site_keys) > 1:
+            raise ValueError(
+                f"inventory host {host_name!r} matches node {nodes[host_name]!r}"
+                f" in sites {', '.join(site_keys)}; set 'attach_site' to pick one"
+            )
+
+
+def _claim(taken: Dict[Any, str], addr: str | None, owner: str) -> None:
+    if not addr:
+        return
+
+    ip = ipaddress.ip_interface(addr).ip
+    if ip in taken:
+        raise ValueError(f"{owner} address {ip} collides with {taken[ip]}")
+    taken[ip] = owner
+
+
+def _segment_addresses(
+    members: List[Tuple[str, NodeModel, str, InterfaceModel]],
+    client_name: str,
+    namespaces: List[Dict[str, Any]],
+) -> Dict[Any, str]:
+    taken: Dict[Any, str] = {}
+
+    for m_node_name, _, m_ifname, m_iface in members:
+        for addr in (m_iface.addr4, m_iface.addr6):
+            if addr:
+                taken.setdefault(
+                    _normalize_router_iface(addr).ip,
+                    f"router interface {m_node_name}:{m_ifname}",
                 )
 
-            site.nodes[client_name] = NodeModel(
-                name=client_name,
-                role="client",
-                routing_domain=node.routing_domain,
-                interfaces={
-                    ifname: InterfaceModel(
-                        name=ifname,
-                        addr4=client_v4,
-                        addr6=client_v6,
-                        kind="tenant",
-                        tenant=iface.tenant,
-                        upstream=ifname,
-                        routes=routes,
-                    )
-                },
+    _, _, _, iface = members[0]
+    for addr in (iface.addr4, iface.addr6):
+        if addr:
+            taken.setdefault(
+                ipaddress.ip_interface(_derive_client_iface(addr)[1]).ip,
+                f"client {client_name!r}",
             )
 
-            print(f"WARNING {client_name} injected to the config.")
+    for namespace in namespaces:
+        for key in ("addr4", "addr6"):
+            if namespace.get(key):
+                taken.setdefault(
+                    ipaddress.ip_interface(namespace[key]).ip,
+                    f"client namespace {namespace['name']!r}",
+                )
+
+    return taken
+
+
+def _inject_namespace_clients(site: SiteModel) -> None:
+    segments: Dict[str, List[Tuple[str, NodeModel, str, InterfaceModel]]] = {}
+
+    for candidate in _client_candidates(site):
+        segments.setdefault(_segment_key(candidate[3]), []).append(candidate)
+
+    hosts = _inventory_hosts(site)
+
+    for segment in sorted(segments.keys()):
+        members = sorted(segments[segment], key=lambda m: (m[0], m[2]))
+        node_name, node, ifname, iface = members[0]
+
+        client_name = f"clients-{node_name}-{ifname}"
+        if client_name in site.nodes:
+            continue
+
+        namespaces: List[Dict[str, Any]] = [
+            _derived_namespace(m_node_name, m_ifname, m_iface)
+            for m_node_name, _, m_ifname, m_iface in members[1:]
+        ]
+
+        taken = _segment_addresses(members, client_name, namespaces)
+
+        for host_name, host in hosts:
+            for m_node_name, _, _, m_iface in members:
+                if _host_matches(host, site, m_node_name, m_iface):
+                    namespace = _inventory_namespace(host_name, host, m_iface)
+                    _claim(taken, namespace.get("addr4"), f"inventory host {host_name!r}")
+                    _claim(taken, namespace.get("addr6"), f"inventory host {host_name!r}")
+                    namespaces.append(namespace)
+                    break
+
+        seen: set[str] = set()
+        for namespace in namespaces:
+            if namespace["name"] in seen:
+                raise ValueError(
+                    f"duplicate client namespace {namespace['name']!r} on {client_name!r}"
+                )
+            seen.add(namespace["name"])
+
+        client = _client_node(client_name, node, ifname, iface)
+        client.control_modules["client_namespaces"] = ControlModuleModel(
+            name="client_namespaces",
+            logical_id=client_name,
+            kind="client_namespaces",
+            spec={"namespaces": namespaces},
+        )
+        site.nodes[client_name] = client
+
+        print(
+            f"WARNING {client_name} injected to the config"
+            f" with {len(namespaces)} namespace client(s)."
+        )
+
+
+def inject_clients(site: SiteModel, mode: str = "container") -> None:
+    if mode not in CLIENT_MODES:
+        raise ValueError(f"unknown client mode {mode!r}")
+
+    if mode == "namespace":
+        _inject_namespace_clients(site)
+        return
+
+    for node_name, node, ifname, iface in _client_candidates(site):
+        client_name = f"client-{node_name}-{ifname}"
+        if client_name in site.nodes:
+            continue
+
+        site.nodes[client_name] = _client_node(client_name, node, ifname, iface)
+
+        print(f"WARNING {client_name} injected to the config.")
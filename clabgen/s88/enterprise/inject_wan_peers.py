@@ -1,7 +1,7 @@
 # ./clabgen/s88/enterprise/inject_wan_peers.py
 from __future__ import annotations
 
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, Tuple
 import hashlib
 import ipaddress
 
@@ -11,6 +11,9 @@ from clabgen.models import SiteModel, NodeModel, InterfaceModel
 MAX_NODE_NAME = 32
 MAX_IFACE_NAME = 15
 
+WAN_PEER_MODES = ("per-link", "site", "enterprise")
+INTERNET_NODE = "internet"
+
 
 def _ip_only(value: Any) -> str | None:
     if not isinstance(value, str) or not value:
@@ -49,9 +52,9 @@ def _short_iface(link_name: str) -> str:
     return name
 
 
-def inject_emulated_wan_peers(site: SiteModel) -> None:
-    new_nodes: Dict[str, NodeModel] = {}
-
+def _wan_uplinks(
+    site: SiteModel,
+) -> Iterator[Tuple[str, Any, str, NodeModel, str, InterfaceModel, Dict[str, Any]]]:
     for link_name, link in list(site.links.items()):
         if getattr(link, "kind", None) != "wan":
             continue
@@ -77,48 +80,118 @@ def inject_emulated_wan_peers(site: SiteModel) -> None:
         if local_iface is None:
             continue
 
-        peer_name = _short_node(link_name, local_node_name, iface_name)
+        yield link_name, link, local_node_name, local_node, iface_name, local_iface, local_ep
+
+
+def _upstream(local_ep: Dict[str, Any], local_iface: InterfaceModel) -> str | None:
+    upstream = (
+        local_ep.get("uplink")
+        or local_ep.get("upstream")
+        or getattr(local_iface, "upstream", None)
+    )
+    return upstream if isinstance(upstream, str) else None
+
+
+def _peer_iface(
+    peer_iface: str,
+    local_ep: Dict[str, Any],
+    upstream: str | None,
+) -> InterfaceModel:
+    peer_addr4 = local_ep.get("peerAddr4")
+    peer_addr6 = local_ep.get("peerAddr6")
+
+    return InterfaceModel(
+        name=peer_iface,
+        addr4=peer_addr4 if isinstance(peer_addr4, str) else None,
+        addr6=peer_addr6 if isinstance(peer_addr6, str) else None,
+        kind="wan",
+        upstream=upstream,
+    )
+
+
+def _peer_endpoint(
+    peer_name: str,
+    peer_iface: str,
+    local_ep: Dict[str, Any],
+    upstream: str | None,
+) -> Dict[str, Any]:
+    return {
+        "node": peer_name,
+        "interface": peer_iface,
+        "addr4": local_ep.get("peerAddr4"),
+        "addr6": local_ep.get("peerAddr6"),
+        "kind": "wan",
+        "uplink": upstream,
+        "upstream": upstream,
+    }
+
+
+def _inject_internet_node(site: SiteModel) -> None:
+    if INTERNET_NODE in site.nodes:
+        raise ValueError(
+            f"site {site.enterprise}-{site.site} already has a node named {INTERNET_NODE!r}"
+        )
 
-        if peer_name in site.nodes or peer_name in new_nodes:
-            continue
+    interfaces: Dict[str, InterfaceModel] = {}
 
+    for link_name, link, local_node_name, local_node, iface_name, local_iface, local_ep in _wan_uplinks(site):
         peer_iface = _short_iface(link_name)
+        if peer_iface in interfaces:
+            raise ValueError(f"internet uplink interface collision for link {link_name!r}")
 
-        peer_addr4 = local_ep.get("peerAddr4")
-        peer_addr6 = local_ep.get("peerAddr6")
+        upstream = _upstream(local_ep, local_iface)
+        interfaces[peer_iface] = _peer_iface(peer_iface, local_ep, upstream)
+        link.endpoints[INTERNET_NODE] = _peer_endpoint(INTERNET_NODE, peer_iface, local_ep, upstream)
 
-        upstream = (
-            local_ep.get("uplink")
-            or local_ep.get("upstream")
-            or getattr(local_iface, "upstream", None)
+        print(
+            "[inject_wan_peers] uplink attached:"
+            f" link={link_name}"
+            f" local={local_node_name}:{iface_name}"
+            f" peer={INTERNET_NODE}:{peer_iface}"
         )
 
+    if not interfaces:
+        return
+
+    site.nodes[INTERNET_NODE] = NodeModel(
+        name=INTERNET_NODE,
+        role="internet",
+        routing_domain="",
+        interfaces=interfaces,
+    )
+
+
+def inject_emulated_wan_peers(site: SiteModel, mode: str = "per-link") -> None:
+    if mode not in WAN_PEER_MODES:
+        raise ValueError(f"unknown wan peer mode {mode!r}")
+
+    if mode != "per-link":
+        _inject_internet_node(site)
+        return
+
+    new_nodes: Dict[str, NodeModel] = {}
+
+    for link_name, link, local_node_name, local_node, iface_name, local_iface, local_ep in _wan_uplinks(site):
+        peer_name = _short_node(link_name, local_node_name, iface_name)
+
+        if peer_name in site.nodes or peer_name in new_nodes:
+            continue
+
+        peer_iface = _short_iface(link_name)
+        upstream = _upstream(local_ep, local_iface)
+
         peer_node = NodeModel(
             name=peer_name,
             role="wan-peer",
             routing_domain=getattr(local_node, "routing_domain", ""),
             interfaces={
-                peer_iface: InterfaceModel(
-                    name=peer_iface,
-                    addr4=peer_addr4 if isinstance(peer_addr4, str) else None,
-                    addr6=peer_addr6 if isinstance(peer_addr6, str) else None,
-                    kind="wan",
-                    upstream=upstream if isinstance(upstream, str) else None,
-                )
+                peer_iface: _peer_iface(peer_iface, local_ep, upstream),
             },
         )
 
         new_nodes[peer_name] = peer_node
 
-        link.endpoints[peer_name] = {
-            "node": peer_name,
-            "interface": peer_iface,
-            "addr4": peer_addr4,
-            "addr6": peer_addr6,
-            "kind": "wan",
-            "uplink": upstream,
-            "upstream": upstream,
-        }
+        link.endpoints[peer_name] = _peer_endpoint(peer_name, peer_iface, local_ep, upstream)
 
         print(
             "[inject_wan_peers] endpoint created:"
@@ -0,0 +1,322 @@
+# ./clabgen/s88/enterprise/shard.py
+from __future__ import annotations
+
+from typing import Any, Dict, List, Set, Tuple
+import copy
+import hashlib
+
+
+ROLE_WEIGHTS: Dict[str, int] = {
+    "core": 4,
+    "policy": 4,
+    "upstream-selector": 3,
+    "internet": 3,
+    "access": 2,
+    "wan-peer": 1,
+    "client": 1,
+}
+DEFAULT_WEIGHT = 2
+
+CAPACITY_SLACK = 1.15
+
+VXLAN_UDP_PORT = 4789
+VNI_BASE = 4096
+VNI_SPACE = (1 << 24) - VNI_BASE
+
+
+def _endpoint_node(endpoint: Any) -> str | None:
+    if not isinstance(endpoint, str) or ":" not in endpoint:
+        return None
+    node_name, _ = endpoint.split(":", 1)
+    if node_name == "host":
+        return None
+    return node_name
+
+
+def _link_nodes(link: Dict[str, Any]) -> List[str]:
+    return [
+        node_name
+        for node_name in (_endpoint_node(ep) for ep in link.get("endpoints", []))
+        if node_name is not None
+    ]
+
+
+def _is_cuttable(link: Dict[str, Any]) -> bool:
+    endpoints = list(link.get("endpoints", []))
+    return len(endpoints) == 2 and len(_link_nodes(link)) == 2
+
+
+class _UnionFind:
+    def __init__(self, names: List[str]) -> None:
+        self.parent = {name: name for name in names}
+
+    def find(self, name: str) -> str:
+        root = name
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[name] != root:
+            self.parent[name], name = root, self.parent[name]
+        return root
+
+    def union(self, a: str, b: str) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            first, second = sorted((ra, rb))
+            self.parent[second] = first
+
+
+def _units(
+    nodes: List[str],
+    links: List[Dict[str, Any]],
+) -> Dict[str, List[str]]:
+    uf = _UnionFind(nodes)
+
+    for link in links:
+        if _is_cuttable(link):
+            continue
+        members = [n for n in _link_nodes(link) if n in uf.parent]
+        for other in members[1:]:
+            uf.union(members[0], other)
+
+    units: Dict[str, List[str]] = {}
+    for node_name in nodes:
+        units.setdefault(uf.find(node_name), []).append(node_name)
+    return units
+
+
+def _weight(node_meta: Dict[str, Dict[str, str]], node_name: str) -> int:
+    role = (node_meta.get(node_name) or {}).get("role", "")
+    return ROLE_WEIGHTS.get(role, DEFAULT_WEIGHT)
+
+
+def _unit_graph(
+    units: Dict[str, List[str]],
+    links: List[Dict[str, Any]],
+) -> Dict[str, Dict[str, int]]:
+    unit_of = {n: unit for unit, members in units.items() for n in members}
+    graph: Dict[str, Dict[str, int]] = {unit: {} for unit in units}
+
+    for link in links:
+        if not _is_cuttable(link):
+            continue
+        a, b = (unit_of[n] for n in _link_nodes(link))
+        if a == b:
+            continue
+        graph[a][b] = graph[a].get(b, 0) + 1
+        graph[b][a] = graph[b].get(a, 0) + 1
+
+    return graph
+
+
+def _bfs_order(start: str, members: Set[str], graph: Dict[str, Dict[str, int]]) -> List[str]:
+    order: List[str] = []
+    seen: Set[str] = set()
+
+    for seed in [start] + sorted(members):
+        if seed in seen:
+            continue
+        queue = [seed]
+        seen.add(seed)
+        while queue:
+            current = queue.pop(0)
+            order.append(current)
+            for neighbor in sorted(graph[current]):
+                if neighbor in members and neighbor not in seen:
+                    seen.add(neighbor)
+                    queue.append(neighbor)
+
+    return order
+
+
+def partition(
+    rendered: Dict[str, Any],
+    host_count: int,
+) -> Dict[str, int]:
+    if host_count < 1:
+        raise ValueError("host count must be at least 1")
+
+    nodes = sorted(rendered["topology"]["nodes"].keys())
+    links = list(rendered["topology"]["links"])
+    node_meta = dict(rendered.get("node_meta", {}) or {})
+
+    units = _units(nodes, links)
+    graph = _unit_graph(units, links)
+    unit_weight = {
+        unit: sum(_weight(node_meta, n) for n in members)
+        for unit, members in units.items()
+    }
+
+    sites: Dict[str, List[str]] = {}
+    for unit, members in units.items():
+        site_votes: Dict[str, int] = {}
+        for n in members:
+            site = (node_meta.get(n) or {}).get("site", "")
+            site_votes[site] = site_votes.get(site, 0) + 1
+        site = sorted(site_votes.items(), key=lambda x: (-x[1], x[0]))[0][0]
+        sites.setdefault(site, []).append(unit)
+
+    total = sum(unit_weight.values())
+    capacity = max(total / host_count * CAPACITY_SLACK, max(unit_weight.values(), default=0))
+    load = [0] * host_count
+    assignment: Dict[str, int] = {}
+
+    def least_loaded() -> int:
+        return min(range(host_count), key=lambda h: (load[h], h))
+
+    site_weight = {site: sum(unit_weight[u] for u in members) for site, members in sites.items()}
+
+    for site in sorted(sites, key=lambda s: (-site_weight[s], s)):
+        host = least_loaded()
+        if load[host] + site_weight[site] <= capacity:
+            for unit in sites[site]:
+                assignment[unit] = host
+            load[host] += site_weight[site]
+            continue
+
+        members = set(sites[site])
+        start = sorted(members, key=lambda u: (-unit_weight[u], u))[0]
+        for unit in _bfs_order(start, members, graph):
+            if load[host] + unit_weight[unit] > capacity:
+                host = least_loaded()
+            assignment[unit] = host
+            load[host] += unit_weight[unit]
+
+    for _ in range(2):
+        moved = False
+        for unit in sorted(units):
+            current = assignment[unit]
+            affinity = [0] * host_count
+            for neighbor, count in graph[unit].items():
+                affinity[assignment[neighbor]] += count
+
+            target = max(range(host_count), key=lambda h: (affinity[h], h == current, -h))
+            if target == current or affinity[target] <= affinity[current]:
+                continue
+            if load[target] + unit_weight[unit] > capacity:
+                continue
+
+            assignment[unit] = target
+            load[current] -= unit_weight[unit]
+            load[target] += unit_weight[unit]
+            moved = True
+
+        if not moved:
+            break
+
+    return {n: assignment[unit] for unit, members in units.items() for n in members}
+
+
+def _vni(key: str, used: Set[int]) -> int:
+    digest = int.from_bytes(hashlib.blake2s(key.encode(), digest_size=4).digest(), "big")
+    vni = VNI_BASE + digest % VNI_SPACE
+
+    while vni in used:
+        vni = VNI_BASE + (vni - VNI_BASE + 1) % VNI_SPACE
+
+    used.add(vni)
+    return vni
+
+
+def _vxlan_link(endpoint: str, remote: str, vni: int) -> Dict[str, Any]:
+    node_name, ifname = endpoint.split(":", 1)
+    return {
+        "type": "vxlan",
+        "endpoint": {
+            "node": node_name,
+            "interface": ifname,
+        },
+        "remote": remote,
+        "vni": vni,
+        "udp-port": VXLAN_UDP_PORT,
+    }
+
+
+def _link_bridge(link: Dict[str, Any]) -> str | None:
+    labels = dict(link.get("labels", {}) or {})
+    if labels.get("clab.link.type") != "bridge":
+        return None
+    return labels.get("clab.link.segment") or labels.get("clab.link.bridge")
+
+
+def shard_topology(
+    rendered: Dict[str, Any],
+    host_addrs: List[str],
+) -> List[Dict[str, Any]]:
+    assignment = partition(rendered, len(host_addrs))
+    topology = rendered["topology"]
+
+    shards: List[Dict[str, Any]] = []
+    for index, addr in enumerate(host_addrs):
+        shard = {key: value for key, value in rendered.items() if key != "topology"}
+        shard["topology"] = {
+            "defaults": copy.deepcopy(topology.get("defaults", {})),
+            "nodes": {},
+            "links": [],
+        }
+        if "groups" in topology:
+            shard["topology"]["groups"] = copy.deepcopy(topology["groups"])
+        shard["host"] = {"index": index, "address": addr, "cut_links": 0}
+        shards.append(shard)
+
+    for node_name, node in topology["nodes"].items():
+        shards[assignment[node_name]]["topology"]["nodes"][node_name] = copy.deepcopy(node)
+
+    used_vnis: Set[int] = set()
+    segments_by_host: List[Set[str]] = [set() for _ in host_addrs]
+    bridged_by_host: List[Set[str]] = [set() for _ in host_addrs]
+
+    cut: List[Tuple[str, List[str]]] = []
+    for link in topology["links"]:
+        hosts = sorted({assignment[n] for n in _link_nodes(link)})
+        if len(hosts) <= 1:
+            host = hosts[0] if hosts else 0
+            shards[host]["topology"]["links"].append(copy.deepcopy(link))
+            segment = _link_bridge(link)
+            if segment is not None:
+                segments_by_host[host].add(segment)
+                bridged_by_host[host].update(link.get("endpoints", []))
+            continue
+        endpoints = sorted(link.get("endpoints", []))
+        cut.append(("|".join(endpoints), endpoints))
+
+    for key, endpoints in sorted(cut):
+        vni = _vni(key, used_vnis)
+        a, b = endpoints
+        host_a = assignment[a.split(":", 1)[0]]
+        host_b = assignment[b.split(":", 1)[0]]
+
+        shards[host_a]["topology"]["links"].append(_vxlan_link(a, host_addrs[host_b], vni))
+        shards[host_b]["topology"]["links"].append(_vxlan_link(b, host_addrs[host_a], vni))
+        shards[host_a]["host"]["cut_links"] += 1
+        shards[host_b]["host"]["cut_links"] += 1
+
+    for shard, segments, bridged in zip(shards, segments_by_host, bridged_by_host):
+        if "vlans" in rendered:
+            # Only ports of bridge links kept on this host; endpoints of cut
+            # links are vxlan ports and must stay off br-fabric.
+            shard["vlans"] = {
+                segment: vid
+                for segment, vid in rendered["vlans"].items()
+                if segment in segments
+            }
+            shard["vlan_host_ports"] = {
+                port: vid
+                for port, vid in rendered.get("vlan_host_ports", {}).items()
+                if f"host:{port}" in bridged
+            }
+            shard["vlan_ports"] = {
+                endpoint: vid
+                for endpoint, vid in rendered.get("vlan_ports", {}).items()
+                if endpoint in bridged
+            }
+            shard["bridges"] = [rendered["vlan_bridge"]] if shard["vlans"] else []
+        else:
+            shard["bridges"] = sorted(b for b in rendered.get("bridges", []) if b in segments)
+
+        shard["node_meta"] = {
+            n: meta
+            for n, meta in (rendered.get("node_meta", {}) or {}).items()
+            if n in shard["topology"]["nodes"]
+        }
+
+    return shards
@@ -1,7 +1,7 @@
 # ./clabgen/s88/enterprise/site_loader.py
 from __future__ import annotations
 
-from typing import Dict, List, Any
+from typing import Any, Collection, Dict, Iterable, List, Tuple
 from pathlib import Path
 import ipaddress
 
@@ -12,52 +12,25 @@ from clabgen.solver import (
     validate_routing_assumptions,
 )
 
-from clabgen.models import SiteModel, NodeModel, InterfaceModel, LinkModel
-
-
-def _dict_list(value: Any, field_name: str) -> List[Dict[str, Any]]:
-    if value is None:
-        return []
-
-    if not isinstance(value, list):
-        raise ValueError(f"{field_name} must be an array")
-
-    result: List[Dict[str, Any]] = []
-
-    for item in value:
-        if not isinstance(item, dict):
-            raise ValueError(f"{field_name} entries must be objects")
-
-        if "dst" not in item:
-            raise ValueError(f"{field_name} route missing 'dst'")
-
-        dst = item["dst"]
-        if not isinstance(dst, str) or not dst:
-            raise ValueError(f"{field_name} route 'dst' must be a non-empty string")
-
-        result.append(dict(item))
-
-    return result
-
-
-def _route_lists(iface: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
-    routes_obj = iface.get("routes")
-    if routes_obj is None:
-        routes_obj = {}
-
-    if not isinstance(routes_obj, dict):
-        raise ValueError("interface.routes must be an object")
+from clabgen.models import (
+    SiteModel,
+    NodeModel,
+    InterfaceModel,
+    LinkModel,
+    RouteTable,
+    intern,
+    route_table,
+)
+from clabgen.validate import check_document
 
-    ipv4 = _dict_list(routes_obj.get("ipv4", []), "interface.routes.ipv4")
-    ipv6 = _dict_list(routes_obj.get("ipv6", []), "interface.routes.ipv6")
 
-    uplink4 = _dict_list(iface.get("uplinkRoutes4", []), "interface.uplinkRoutes4")
-    uplink6 = _dict_list(iface.get("uplinkRoutes6", []), "interface.uplinkRoutes6")
+def _route_lists(iface: Dict[str, Any]) -> RouteTable:
+    routes_obj = iface.get("routes") or {}
 
-    return {
-        "ipv4": ipv4 + uplink4,
-        "ipv6": ipv6 + uplink6,
-    }
+    return route_table(
+        [*(routes_obj.get("ipv4") or []), *(iface.get("uplinkRoutes4") or [])],
+        [*(routes_obj.get("ipv6") or []), *(iface.get("uplinkRoutes6") or [])],
+    )
 
 
 def _endpoint_fallbacks(
@@ -146,16 +119,16 @@ def _build_interfaces(
             tenant_prefix_owners=tenant_prefix_owners,
         )
 
-        interfaces[link_key] = InterfaceModel(
-            name=link_key,
-            addr4=fb["addr4"],
-            addr6=fb["addr6"],
-            ll6=fb["ll6"],
+        interfaces[intern(link_key)] = InterfaceModel(
+            name=intern(link_key),
+            addr4=intern(fb["addr4"]),
+            addr6=intern(fb["addr6"]),
+            ll6=intern(fb["ll6"]),
             routes=_route_lists(iface),
-            kind=fb["kind"],
-            upstream=fb["upstream"],
-            tenant=tenant,
-            overlay=fb["overlay"] if isinstance(fb["overlay"], str) else None,
+            kind=intern(fb["kind"]),
+            upstream=intern(fb["upstream"]),
+            tenant=intern(tenant),
+            overlay=intern(fb["overlay"]) if isinstance(fb["overlay"], str) else None,
         )
 
     return interfaces
@@ -170,10 +143,10 @@ def _build_nodes(
     for unit, node_obj in site.get("nodes", {}).items():
         interfaces = _build_interfaces(site, unit, node_obj, tenant_prefix_owners)
 
-        nodes[unit] = NodeModel(
-            name=unit,
-            role=node_obj.get("role", ""),
-            routing_domain=node_obj.get("routingDomain", ""),
+        nodes[intern(unit)] = NodeModel(
+            name=intern(unit),
+            role=intern(node_obj.get("role", "")),
+            routing_domain=intern(node_obj.get("routingDomain", "")),
             interfaces=interfaces,
             containers=list(node_obj.get("containers", [])),
             isolated=bool(node_obj.get("isolated", False)),
@@ -186,9 +159,9 @@ def _build_links(site: Dict[str, Any]) -> Dict[str, LinkModel]:
     links: Dict[str, LinkModel] = {}
 
     for lk, lo in (site.get("links", {}) or {}).items():
-        links[lk] = LinkModel(
-            name=lk,
-            kind=lo.get("kind", "lan"),
+        links[intern(lk)] = LinkModel(
+            name=intern(lk),
+            kind=intern(lo.get("kind", "lan")),
             endpoints=lo.get("endpoints", {}),
         )
 
@@ -224,57 +197,92 @@ def _tenant_prefix_owners(site: Dict[str, Any]) -> Dict[str, str]:
     return result
 
 
-def load_sites(
-    path: str | Path,
+def load_site(
+    enterprise: str,
+    site_name: str,
+    site: Dict[str, Any],
+    solver_meta: Dict[str, Any] | None = None,
     renderer_inventory: Dict[str, Any] | None = None,
-) -> Dict[str, SiteModel]:
-
-    solver_path = Path(path)
-    data = load_solver(solver_path)
-
-    result: Dict[str, SiteModel] = {}
-    solver_meta = dict(data.get("meta", {}) or {})
-    renderer_inventory = dict(renderer_inventory or {})
-
-    for enterprise, site_name, site in extract_enterprise_sites(data):
-
+    trusted: bool = False,
+) -> SiteModel:
+    if not trusted:
         validate_site_invariants(
             site,
             context={"enterprise": enterprise, "site": site_name},
         )
 
-        assumptions = validate_routing_assumptions(site)
-        tenant_prefix_owners = _tenant_prefix_owners(site)
+    assumptions = validate_routing_assumptions(site)
+    tenant_prefix_owners = _tenant_prefix_owners(site)
+
+    nodes = _build_nodes(site, tenant_prefix_owners)
+    links = _build_links(site)
+
+    raw_policy = dict(site.get("communicationContract", {}) or {})
+    raw_ownership = dict(site.get("ownership", {}) or {})
+    raw_domains = dict(site.get("domains", {}) or {})
+    raw_transport = dict(site.get("transport", {}) or {})
+
+    return SiteModel(
+        enterprise=enterprise,
+        site=site_name,
+        nodes=nodes,
+        links=links,
+        single_access=assumptions.get("singleAccess", ""),
+        domains=raw_domains,
+        raw_policy=raw_policy,
+        raw_nat={},
+        raw_ownership=raw_ownership,
+        raw_transport=raw_transport,
+        renderer_inventory=dict(renderer_inventory or {}),
+        provider_zone_map={},
+        solver_meta=dict(solver_meta or {}),
+        policy_node_name=str(site.get("policyNodeName", "") or ""),
+        upstream_selector_node_name=str(site.get("upstreamSelectorNodeName", "") or ""),
+        tenant_prefix_owners=tenant_prefix_owners,
+    )
 
-        nodes = _build_nodes(site, tenant_prefix_owners)
-        links = _build_links(site)
 
-        raw_policy = dict(site.get("communicationContract", {}) or {})
-        raw_ownership = dict(site.get("ownership", {}) or {})
-        raw_domains = dict(site.get("domains", {}) or {})
-        raw_transport = dict(site.get("transport", {}) or {})
+def site_candidates(data: Dict[str, Any]) -> Iterable[Tuple[str, str, str, List[str]]]:
+    for enterprise, site_name, site in extract_enterprise_sites(data):
+        nodes = site.get("nodes", {})
+        node_names = list(nodes) if isinstance(nodes, dict) else []
+        yield f"{enterprise}-{site_name}", enterprise, site_name, node_names
 
-        key = f"{enterprise}-{site_name}"
 
-        result[key] = SiteModel(
-            enterprise=enterprise,
-            site=site_name,
-            nodes=nodes,
-            links=links,
-            single_access=assumptions.get("singleAccess", ""),
-            domains=raw_domains,
-            raw_policy=raw_policy,
-            raw_nat={},
-            raw_links=dict(site.get("links", {}) or {}),
-            raw_ownership=raw_ownership,
-            raw_domains=raw_domains,
-            raw_transport=raw_transport,
-            renderer_inventory=renderer_inventory,
-            provider_zone_map={},
+def load_sites_from_document(
+    data: Dict[str, Any],
+    renderer_inventory: Dict[str, Any] | None = None,
+    site_keys: Collection[str] | None = None,
+    trusted: bool = False,
+) -> Dict[str, SiteModel]:
+    if not trusted:
+        check_document(data, site_keys)
+
+    result: Dict[str, SiteModel] = {}
+    solver_meta = dict(data.get("meta", {}) or {})
+    renderer_inventory = dict(renderer_inventory or {})
+
+    for enterprise, site_name, site in extract_enterprise_sites(data):
+        key = f"{enterprise}-{site_name}"
+        if site_keys is not None and key not in site_keys:
+            continue
+        result[key] = load_site(
+            enterprise,
+            site_name,
+            site,
             solver_meta=solver_meta,
-            policy_node_name=str(site.get("policyNodeName", "") or ""),
-            upstream_selector_node_name=str(site.get("upstreamSelectorNodeName", "") or ""),
-            tenant_prefix_owners=tenant_prefix_owners,
+            renderer_inventory=renderer_inventory,
+            trusted=True,
         )
 
     return result
+
+
+def load_sites(
+    path: str | Path,
+    renderer_inventory: Dict[str, Any] | None = None,
+) -> Dict[str, SiteModel]:
+    return load_sites_from_document(
+        load_solver(Path(path)),
+        renderer_inventory=renderer_inventory,
+    )
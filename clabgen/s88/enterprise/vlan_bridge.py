@@ -0,0 +1,99 @@
+# ./clabgen/s88/enterprise/vlan_bridge.py
+from __future__ import annotations
+
+from typing import Any, Dict, List, Set, Tuple
+import hashlib
+import shlex
+
+
+VLAN_BRIDGE = "br-fabric"
+FIRST_VID = 2
+LAST_VID = 4094
+VID_SPACE = LAST_VID - FIRST_VID + 1
+
+
+def _vid(segment: str, used: Set[int]) -> int:
+    digest = int.from_bytes(hashlib.blake2s(segment.encode(), digest_size=4).digest(), "big")
+    vid = FIRST_VID + digest % VID_SPACE
+
+    while vid in used:
+        vid = FIRST_VID + (vid - FIRST_VID + 1) % VID_SPACE
+
+    used.add(vid)
+    return vid
+
+
+def assign_vlans(
+    links: List[Dict[str, Any]],
+) -> Tuple[Dict[str, int], Dict[str, int], Dict[str, int]]:
+    segments = sorted(
+        {
+            str((link.get("labels") or {}).get("clab.link.bridge"))
+            for link in links
+            if (link.get("labels") or {}).get("clab.link.type") == "bridge"
+        }
+    )
+
+    if len(segments) > VID_SPACE:
+        raise ValueError(
+            f"{len(segments)} bridged segments do not fit into the 802.1Q VLAN range"
+        )
+
+    used: Set[int] = set()
+    vlans = {segment: _vid(segment, used) for segment in segments}
+    host_ports: Dict[str, int] = {}
+    container_ports: Dict[str, int] = {}
+
+    for link in links:
+        labels = link.get("labels") or {}
+        if labels.get("clab.link.type") != "bridge":
+            continue
+
+        segment = str(labels.get("clab.link.bridge"))
+        vid = vlans[segment]
+
+        labels["clab.link.bridge"] = VLAN_BRIDGE
+        labels["clab.link.vlan"] = str(vid)
+        labels["clab.link.segment"] = segment
+
+        for endpoint in link.get("endpoints", []):
+            if not isinstance(endpoint, str) or ":" not in endpoint:
+                continue
+            if endpoint.startswith("host:"):
+                host_ports[endpoint.split(":", 1)[1]] = vid
+            else:
+                container_ports[endpoint] = vid
+
+    return vlans, host_ports, container_ports
+
+
+def vlan_ports_script(merged: Dict[str, Any], lab_name: str = "fabric") -> str:
+    bridge = merged.get("vlan_bridge", VLAN_BRIDGE)
+    lines = [
+        "#!/bin/sh",
+        "# Access VLAN of every port on the VLAN-filtering bridge.",
+        "# Run after 'containerlab deploy'; re-running it is harmless.",
+        "set -e",
+        "",
+        "port_vlan() {",
+        '  idx=$(docker exec "$1" cat "/sys/class/net/$2/iflink")',
+        "  dev=$(ip -o link show | awk -F': ' -v idx=\"$idx\" '$1 == idx { sub(/@.*/, \"\", $2); print $2 }')",
+        '  if [ -z "$dev" ]; then',
+        '    echo "no host port for $1:$2" >&2',
+        "    exit 1",
+        "  fi",
+        f'  ip link set dev "$dev" master {shlex.quote(bridge)}',
+        '  bridge vlan add dev "$dev" vid "$3" pvid untagged',
+        "}",
+        "",
+    ]
+
+    for stub, vid in sorted(dict(merged.get("vlan_host_ports", {})).items()):
+        lines.append(f"bridge vlan add dev {shlex.quote(stub)} vid {vid} pvid untagged")
+
+    for endpoint, vid in sorted(dict(merged.get("vlan_ports", {})).items()):
+        node_name, ifname = endpoint.split(":", 1)
+        container = f"clab-{lab_name}-{node_name}"
+        lines.append(f"port_vlan {shlex.quote(container)} {shlex.quote(ifname)} {vid}")
+
+    return "\n".join(lines) + "\n"
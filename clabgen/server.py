@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict
+import json
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+
+from clabgen.iface_map import load_iface_map, merge_iface_map, write_iface_map
+from clabgen.models import RenderOptions
+from clabgen.render_cache import RenderCache
+from clabgen.solver import load_solver
+from clabgen import parse_solver_json
+
+
+DEFAULT_WORKERS = 4
+
+
+def default_socket_path() -> Path:
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "clabgen.sock"
+    return Path(tempfile.gettempdir()) / f"clabgen-{os.getuid()}.sock"
+
+
+def _options(raw: Any) -> RenderOptions:
+    if raw is None:
+        return RenderOptions()
+    if not isinstance(raw, dict):
+        raise ValueError("'options' must be an object")
+    known = set(RenderOptions.__dataclass_fields__)
+    unknown = sorted(set(raw) - known)
+    if unknown:
+        raise ValueError(f"unknown render options: {', '.join(unknown)}")
+    return RenderOptions(**raw)
+
+
+class RenderService:
+    def __init__(self, workers: int = DEFAULT_WORKERS) -> None:
+        self.cache = RenderCache()
+        self.slots = threading.BoundedSemaphore(workers)
+        self.provenance = parse_solver_json.render_provenance()
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        if "document" in request:
+            data = request["document"]
+            if not isinstance(data, dict):
+                raise ValueError("solver JSON top-level must be an object")
+        elif "solver_json" in request:
+            data = load_solver(Path(request["solver_json"]))
+        else:
+            raise ValueError("request needs 'document' or 'solver_json'")
+
+        options = _options(request.get("options"))
+        output_format = request.get("format", "yaml")
+        if output_format not in parse_solver_json.OUTPUT_FORMATS:
+            raise ValueError(f"unknown output format {output_format!r}")
+
+        iface_map = request.get("iface_map")
+        allocations = load_iface_map(iface_map) if iface_map else None
+
+        start = time.perf_counter()
+        with self.slots:
+            merged, stats = self.cache.render(
+                data,
+                parse_solver_json.load_renderer_inventory(),
+                options,
+                allocations,
+            )
+
+            if iface_map:
+                write_iface_map(merge_iface_map(allocations or {}, merged["eth_maps"]), iface_map)
+
+            response: Dict[str, Any] = {
+                "ok": True,
+                "nodes": len(merged["topology"]["nodes"]),
+                "links": len(merged["topology"]["links"]),
+                **stats,
+            }
+
+            if request.get("topology_out") and request.get("bridges_out"):
+                parse_solver_json.write_merged(
+                    merged,
+                    request["topology_out"],
+                    request["bridges_out"],
+                    bridges_batch_out=request.get("bridges_batch_out"),
+                    manifest_out=request.get("manifest_out"),
+                    output_format=output_format,
+                    provenance=self.provenance,
+                )
+            else:
+                response["topology"] = parse_solver_json.topology_text(
+                    merged,
+                    output_format,
+                    self.provenance,
+                )
+                response["bridges"] = parse_solver_json.bridges_text(merged)
+
+        response["ms"] = round((time.perf_counter() - start) * 1000, 1)
+        return response
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return
+
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+            response = self.server.service.handle(request)
+        except Exception as e:
+            response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class RenderServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str | Path, service: RenderService) -> None:
+        self.service = service
+        super().__init__(str(path), _Handler)
+
+
+def _remove_stale_socket(path: Path) -> None:
+    if not path.exists():
+        return
+
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(path))
+    except OSError:
+        path.unlink()
+    else:
+        raise RuntimeError(f"a render server is already listening on {path}")
+    finally:
+        probe.close()
+
+
+def serve(path: str | Path | None = None, workers: int = DEFAULT_WORKERS) -> None:
+    path = Path(path) if path is not None else default_socket_path()
+    _remove_stale_socket(path)
+
+    old_umask = os.umask(0o177)
+    try:
+        server = RenderServer(path, RenderService(workers))
+    finally:
+        os.umask(old_umask)
+
+    print(f"[serve] listening on {path} workers={workers}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        path.unlink(missing_ok=True)
+
+
+def request(path: str | Path, payload: Dict[str, Any], timeout: float | None = None) -> Dict[str, Any]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(path))
+        sock.sendall(json.dumps(payload).encode() + b"\n")
+        sock.shutdown(socket.SHUT_WR)
+
+        chunks = []
+        while True:
+            chunk = sock.recv(1 << 16)
+            if not chunk:
+                break
+            chunks.append(chunk)
+
+    return json.loads(b"".join(chunks))
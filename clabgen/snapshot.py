@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Collection, Dict, Iterable, List, Tuple
+import hashlib
+import json
+import os
+import pickle
+import struct
+import tempfile
+
+from clabgen import models, solver, validate
+from clabgen.models import SiteModel
+from clabgen.s88.enterprise import site_loader
+from clabgen.s88.enterprise.enterprise import select_site_keys
+from clabgen.s88.enterprise.site_loader import load_sites_from_document
+from clabgen.solver import load_solver
+
+
+SNAPSHOT_MAGIC = b"CLABSNP2"
+SNAPSHOT_SUFFIX = ".snap"
+
+_HEADER_LEN = struct.Struct(">I")
+
+
+# Modules that decide what a loaded SiteModel contains: the classes the
+# pickles refer to and the loader code that fills them in.
+_SCHEMA_MODULES = (models, site_loader, solver, validate)
+
+
+def _model_schema() -> str:
+    # Any edit to these invalidates every snapshot instead of unpickling
+    # stale models into a newer renderer.
+    h = hashlib.sha256()
+    for module in _SCHEMA_MODULES:
+        h.update(module.__name__.encode())
+        h.update(Path(module.__file__).read_bytes())
+    return h.hexdigest()[:16]
+
+
+def solver_digest(path: str | Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def inventory_digest(renderer_inventory: Dict[str, Any]) -> str:
+    encoded = json.dumps(renderer_inventory, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def snapshot_path(snapshot_dir: str | Path, digest: str) -> Path:
+    return Path(snapshot_dir) / f"{digest}{SNAPSHOT_SUFFIX}"
+
+
+def write_snapshot(
+    path: str | Path,
+    sites: Dict[str, SiteModel],
+    inventory: str,
+) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    blobs = [pickle.dumps(site, protocol=pickle.HIGHEST_PROTOCOL) for site in sites.values()]
+
+    index: List[Tuple[str, int, int, str, str, List[str]]] = []
+    offset = 0
+    for (key, site), blob in zip(sites.items(), blobs):
+        index.append((key, offset, len(blob), site.enterprise, site.site, sorted(site.nodes)))
+        offset += len(blob)
+
+    header = json.dumps(
+        {
+            "schema": _model_schema(),
+            "inventory": inventory,
+            "sites": index,
+        },
+        separators=(",", ":"),
+    ).encode()
+
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(SNAPSHOT_MAGIC)
+            f.write(_HEADER_LEN.pack(len(header)))
+            f.write(header)
+            for blob in blobs:
+                f.write(blob)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def read_index(path: str | Path) -> Tuple[Dict[str, Any], int]:
+    with open(path, "rb") as f:
+        if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not a site snapshot")
+        (length,) = _HEADER_LEN.unpack(f.read(_HEADER_LEN.size))
+        header = json.loads(f.read(length))
+
+    return header, len(SNAPSHOT_MAGIC) + _HEADER_LEN.size + length
+
+
+def load_snapshot(
+    path: str | Path,
+    inventory: str,
+    site_keys: Iterable[str] | None = None,
+) -> Dict[str, SiteModel] | None:
+    try:
+        header, data_start = read_index(path)
+    except (OSError, ValueError, struct.error):
+        return None
+
+    if header.get("schema") != _model_schema() or header.get("inventory") != inventory:
+        return None
+
+    wanted = set(site_keys) if site_keys is not None else None
+    result: Dict[str, SiteModel] = {}
+
+    try:
+        with open(path, "rb") as f:
+            for key, offset, length, *_ in header["sites"]:
+                if wanted is not None and key not in wanted:
+                    continue
+                f.seek(data_start + offset)
+                result[key] = pickle.loads(f.read(length))
+    except (OSError, EOFError, AttributeError, pickle.UnpicklingError):
+        return None
+
+    return result
+
+
+def _candidates(header: Dict[str, Any]) -> Iterable[Tuple[str, str, str, List[str]]]:
+    for key, _, _, enterprise, site_name, node_names in header["sites"]:
+        yield key, enterprise, site_name, node_names
+
+
+def load_sites(
+    solver_json: str | Path,
+    renderer_inventory: Dict[str, Any],
+    snapshot_dir: str | Path,
+    sites: Collection[str] | None = None,
+    nodes: Collection[str] | None = None,
+) -> Tuple[Dict[str, SiteModel], bool]:
+    path = snapshot_path(snapshot_dir, solver_digest(solver_json))
+    inventory = inventory_digest(renderer_inventory)
+
+    try:
+        header, _ = read_index(path)
+        site_keys = select_site_keys(_candidates(header), sites, nodes)
+    except (OSError, ValueError, struct.error):
+        site_keys = None
+
+    cached = load_snapshot(path, inventory, site_keys)
+    if cached is not None:
+        return cached, True
+
+    loaded = load_sites_from_document(
+        load_solver(Path(solver_json)),
+        renderer_inventory=renderer_inventory,
+    )
+    write_snapshot(path, loaded, inventory)
+
+    site_keys = select_site_keys(
+        ((key, site.enterprise, site.site, list(site.nodes)) for key, site in loaded.items()),
+        sites,
+        nodes,
+    )
+    if site_keys is not None:
+        loaded = {key: site for key, site in loaded.items() if key in site_keys}
+    return loaded, False
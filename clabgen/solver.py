@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from typing import Any, Dict, Iterable, Tuple
 
+from clabgen.json_decode import load_file
+from clabgen.validate import SolverValidationError, site_path, validate_site
+
 
 def load_solver(path: Path) -> Dict[str, Any]:
-    with path.open() as f:
-        data = json.load(f)
+    data = load_file(path)
 
     if not isinstance(data, dict):
         raise ValueError("solver JSON top-level must be an object")
@@ -38,47 +39,11 @@ def extract_enterprise_sites(data: Dict[str, Any]) -> Iterable[Tuple[str, str, D
 
 def validate_site_invariants(site: Dict[str, Any], context: Dict[str, str] | None = None) -> None:
     ctx = context or {}
+    path = site_path(ctx["enterprise"], ctx["site"]) if {"enterprise", "site"} <= set(ctx) else "$"
 
-    if "nodes" not in site or "links" not in site:
-        raise ValueError(
-            f"Invalid site schema for {ctx}: missing 'nodes' or 'links'"
-        )
-
-    if not isinstance(site.get("nodes"), dict):
-        raise ValueError(f"Invalid site schema for {ctx}: 'nodes' must be an object")
-
-    if not isinstance(site.get("links"), dict):
-        raise ValueError(f"Invalid site schema for {ctx}: 'links' must be an object")
-
-    if "coreNodeNames" in site and not isinstance(site.get("coreNodeNames"), list):
-        raise ValueError(
-            f"Invalid site schema for {ctx}: 'coreNodeNames' must be an array"
-        )
-
-    if "uplinkCoreNames" in site and not isinstance(site.get("uplinkCoreNames"), list):
-        raise ValueError(
-            f"Invalid site schema for {ctx}: 'uplinkCoreNames' must be an array"
-        )
-
-    if "uplinkNames" in site and not isinstance(site.get("uplinkNames"), list):
-        raise ValueError(
-            f"Invalid site schema for {ctx}: 'uplinkNames' must be an array"
-        )
-
-    if "tenantPrefixOwners" in site and not isinstance(site.get("tenantPrefixOwners"), dict):
-        raise ValueError(
-            f"Invalid site schema for {ctx}: 'tenantPrefixOwners' must be an object"
-        )
-
-    if "policyNodeName" in site and not isinstance(site.get("policyNodeName"), str):
-        raise ValueError(
-            f"Invalid site schema for {ctx}: 'policyNodeName' must be a string"
-        )
-
-    if "upstreamSelectorNodeName" in site and not isinstance(site.get("upstreamSelectorNodeName"), str):
-        raise ValueError(
-            f"Invalid site schema for {ctx}: 'upstreamSelectorNodeName' must be a string"
-        )
+    errors = validate_site(site, path)
+    if errors:
+        raise SolverValidationError(errors)
 
 
 def validate_routing_assumptions(site: Dict[str, Any]) -> Dict[str, Any]:
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from typing import Any, Collection, Dict, List, Tuple
+import re
+
+
+_PLAIN_KEY = re.compile(r"^[A-Za-z_][A-Za-z0-9_-]*$")
+
+_SITE_FIELDS: Tuple[Tuple[str, type, str], ...] = (
+    ("coreNodeNames", list, "an array"),
+    ("uplinkCoreNames", list, "an array"),
+    ("uplinkNames", list, "an array"),
+    ("tenantPrefixOwners", dict, "an object"),
+    ("policyNodeName", str, "a string"),
+    ("upstreamSelectorNodeName", str, "a string"),
+)
+
+_ROUTE_FAMILIES = ("ipv4", "ipv6")
+
+_UPLINK_ROUTE_FIELDS = ("uplinkRoutes4", "uplinkRoutes6")
+
+
+class SolverValidationError(ValueError):
+    def __init__(self, errors: List[str]) -> None:
+        self.errors = list(errors)
+        lines = [f"solver document has {len(self.errors)} error(s):"]
+        lines.extend(f"  {error}" for error in self.errors)
+        super().__init__("\n".join(lines))
+
+
+def child(path: str, key: Any) -> str:
+    if isinstance(key, int):
+        return f"{path}[{key}]"
+    if isinstance(key, str) and _PLAIN_KEY.match(key):
+        return f"{path}.{key}"
+    return f"{path}[{key!r}]"
+
+
+def site_path(enterprise: str, site_name: str) -> str:
+    return child(child(child(child("$", "enterprise"), enterprise), "site"), site_name)
+
+
+def _routes(value: Any, path: str, errors: List[str]) -> None:
+    if value is None:
+        return
+
+    if not isinstance(value, list):
+        errors.append(f"{path}: must be an array")
+        return
+
+    for index, item in enumerate(value):
+        item_path = child(path, index)
+        if not isinstance(item, dict):
+            errors.append(f"{item_path}: must be an object")
+            continue
+
+        dst = item.get("dst")
+        if not isinstance(dst, str) or not dst:
+            errors.append(f"{child(item_path, 'dst')}: must be a non-empty string")
+
+
+def _interface(iface: Any, path: str, errors: List[str]) -> None:
+    if not isinstance(iface, dict):
+        errors.append(f"{path}: must be an object")
+        return
+
+    routes = iface.get("routes")
+    if routes is not None and not isinstance(routes, dict):
+        errors.append(f"{child(path, 'routes')}: must be an object")
+    elif routes is not None:
+        for family in _ROUTE_FAMILIES:
+            _routes(routes.get(family), child(child(path, "routes"), family), errors)
+
+    for field in _UPLINK_ROUTE_FIELDS:
+        _routes(iface.get(field), child(path, field), errors)
+
+
+def _node(node: Any, path: str, errors: List[str]) -> None:
+    if not isinstance(node, dict):
+        errors.append(f"{path}: must be an object")
+        return
+
+    interfaces = node.get("interfaces", {})
+    if not isinstance(interfaces, dict):
+        errors.append(f"{child(path, 'interfaces')}: must be an object")
+        return
+
+    for ifname, iface in interfaces.items():
+        _interface(iface, child(child(path, "interfaces"), ifname), errors)
+
+
+def _link(link: Any, path: str, errors: List[str]) -> None:
+    if not isinstance(link, dict):
+        errors.append(f"{path}: must be an object")
+        return
+
+    endpoints = link.get("endpoints", {})
+    if not isinstance(endpoints, dict):
+        errors.append(f"{child(path, 'endpoints')}: must be an object")
+        return
+
+    for node_name, ep in endpoints.items():
+        if not isinstance(ep, dict):
+            errors.append(f"{child(child(path, 'endpoints'), node_name)}: must be an object")
+
+
+def validate_site(site: Dict[str, Any], path: str = "$") -> List[str]:
+    errors: List[str] = []
+
+    for field in ("nodes", "links"):
+        if field not in site:
+            errors.append(f"{child(path, field)}: missing")
+        elif not isinstance(site[field], dict):
+            errors.append(f"{child(path, field)}: must be an object")
+
+    for field, expected, label in _SITE_FIELDS:
+        if field in site and not isinstance(site[field], expected):
+            errors.append(f"{child(path, field)}: must be {label}")
+
+    if isinstance(site.get("nodes"), dict):
+        for node_name, node in site["nodes"].items():
+            _node(node, child(child(path, "nodes"), node_name), errors)
+
+    if isinstance(site.get("links"), dict):
+        for link_name, link in site["links"].items():
+            _link(link, child(child(path, "links"), link_name), errors)
+
+    return errors
+
+
+def validate_document(
+    data: Any,
+    site_keys: Collection[str] | None = None,
+) -> List[str]:
+    if not isinstance(data, dict):
+        return ["$: solver JSON top-level must be an object"]
+
+    enterprise_root = data.get("enterprise")
+    if not isinstance(enterprise_root, dict):
+        return ["$.enterprise: must be an object"]
+
+    errors: List[str] = []
+
+    for enterprise, enterprise_obj in enterprise_root.items():
+        enterprise_path = child("$.enterprise", enterprise)
+        if not isinstance(enterprise_obj, dict):
+            errors.append(f"{enterprise_path}: must be an object")
+            continue
+
+        site_root = enterprise_obj.get("site")
+        if not isinstance(site_root, dict):
+            errors.append(f"{child(enterprise_path, 'site')}: must be an object")
+            continue
+
+        for site_name, site in site_root.items():
+            if site_keys is not None and f"{enterprise}-{site_name}" not in site_keys:
+                continue
+
+            path = site_path(enterprise, site_name)
+            if not isinstance(site, dict):
+                errors.append(f"{path}: must be an object")
+                continue
+
+            errors.extend(validate_site(site, path))
+
+    return errors
+
+
+def check_document(
+    data: Any,
+    site_keys: Collection[str] | None = None,
+) -> None:
+    errors = validate_document(data, site_keys)
+    if errors:
+        raise SolverValidationError(errors)
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, Tuple
+import time
+
+from clabgen.iface_map import load_iface_map, merge_iface_map, write_iface_map
+from clabgen.models import RenderOptions
+from clabgen.render_cache import RenderCache
+from clabgen.solver import load_solver
+from clabgen import parse_solver_json
+
+
+POLL_INTERVAL = 0.2
+
+
+def _stat(path: Path) -> Tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class Watcher:
+    def __init__(
+        self,
+        solver_json: str | Path,
+        topology_out: str | Path,
+        bridges_out: str | Path,
+        options: RenderOptions | None = None,
+        iface_map: str | Path | None = None,
+        output_format: str = "yaml",
+        bridges_batch_out: str | Path | None = None,
+        manifest_out: str | Path | None = None,
+    ) -> None:
+        self.solver_json = Path(solver_json)
+        self.inventory_file = parse_solver_json.renderer_inventory_path()
+        self.topology_out = topology_out
+        self.bridges_out = bridges_out
+        self.options = options or RenderOptions()
+        self.iface_map = iface_map
+        self.output_format = output_format
+        self.bridges_batch_out = bridges_batch_out
+        self.manifest_out = manifest_out
+
+        self.cache = RenderCache()
+        self.provenance = parse_solver_json.render_provenance()
+        self.yaml_cache = None
+        if output_format == "yaml":
+            from clabgen.clab_yaml import DumpCache
+
+            self.yaml_cache = DumpCache()
+        self.allocations = load_iface_map(iface_map) if iface_map is not None else {}
+        self._stamps: Tuple[Any, Any] | None = None
+
+    def _current_stamps(self) -> Tuple[Any, Any]:
+        return _stat(self.solver_json), _stat(self.inventory_file)
+
+    def changed(self) -> bool:
+        return self._current_stamps() != self._stamps
+
+    def refresh(self) -> Dict[str, Any]:
+        self._stamps = self._current_stamps()
+        start = time.perf_counter()
+
+        data = load_solver(self.solver_json)
+        inventory = parse_solver_json.load_renderer_inventory()
+        merged, stats = self.cache.render(data, inventory, self.options, self.allocations)
+
+        if self.iface_map is not None:
+            self.allocations = merge_iface_map(self.allocations, merged["eth_maps"])
+            write_iface_map(self.allocations, self.iface_map)
+
+        parse_solver_json.write_merged(
+            merged,
+            self.topology_out,
+            self.bridges_out,
+            bridges_batch_out=self.bridges_batch_out,
+            manifest_out=self.manifest_out,
+            output_format=self.output_format,
+            provenance=self.provenance,
+            yaml_cache=self.yaml_cache,
+        )
+
+        print(
+            f"[watch] sites={stats['sites']} reloaded={stats['reloaded']}"
+            f" rerendered={stats['rerendered']}"
+            f" in {(time.perf_counter() - start) * 1000:.0f} ms"
+        )
+        return merged
+
+    def run(self, interval: float = POLL_INTERVAL) -> None:
+        print(f"[watch] watching {self.solver_json} and {self.inventory_file}")
+
+        while True:
+            if self.changed():
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"[watch] render failed, keeping previous outputs: {type(e).__name__}: {e}")
+            time.sleep(interval)
@@ -0,0 +1,10 @@
+#!/usr/bin/env bash
+set -e
+
+IMAGE=clab-client:latest
+DIR="$(cd "$(dirname "$0")" && pwd)"
+
+if ! docker image inspect "$IMAGE" >/dev/null 2>&1; then
+    echo "[clab] building local client image..."
+    docker build -t "$IMAGE" "$DIR"
+fi
@@ -37,35 +37,88 @@
 
           runtimeInputs = [
             pythonEnv
-            pkgs.jq
+            pkgs.coreutils
+            pkgs.findutils
+            pkgs.nix
           ];
 
           text = ''
             set -euo pipefail
 
-            if [ "$#" -lt 1 ]; then
-              echo "Usage: $0 <input.nix> [output-topology.yml] [output-bridges.nix]"
+            USE_CACHE=1
+            ARGS=()
+            for arg in "$@"; do
+              case "$arg" in
+                --no-cache) USE_CACHE=0 ;;
+                *) ARGS+=("$arg") ;;
+              esac
+            done
+
+            if [ "''${#ARGS[@]}" -lt 1 ]; then
+              echo "Usage: $0 [--no-cache] <input.nix> [output-topology.yml] [output-bridges.nix]"
               exit 1
             fi
 
-            INPUT_NIX="$1"
-            OUTPUT_JSON="output-solver-signed.json"
-            TOPO_OUT="''${2:-fabric.clab.yml}"
-            BRIDGES_OUT="''${3:-vm-bridges-generated.nix}"
+            INPUT_NIX="''${ARGS[0]}"
+            TOPO_OUT="''${ARGS[1]:-fabric.clab.yml}"
+            BRIDGES_OUT="''${ARGS[2]:-vm-bridges-generated.nix}"
 
-            echo "[*] Running solver..."
-            ${solverApp} "$INPUT_NIX" > "$OUTPUT_JSON"
+            export PYTHONPYCACHEPREFIX=/tmp/python-cache
 
-            echo "[*] Validating JSON..."
-            jq empty "$OUTPUT_JSON"
+            render() {
+              PYTHONPATH="$(pwd)" \
+                ${pythonEnv}/bin/python3 ${./generate-clab-config.py} \
+                  "$1" "$TOPO_OUT" "$BRIDGES_OUT" "''${@:2}"
+            }
 
-            echo "[*] Generating Containerlab topology..."
+            if [ "$USE_CACHE" -eq 0 ]; then
+              echo "[*] Running solver and generating Containerlab topology..."
+              ${solverApp} "$INPUT_NIX" | render -
+              exit 0
+            fi
 
-            export PYTHONPYCACHEPREFIX=/tmp/python-cache
+            # The key is the fully evaluated input, so every file it imports
+            # (../common/*.nix included) is covered, plus the exact solver
+            # build from flake.lock. Paths in the value evaluate to their
+            # content-addressed store paths. Inputs that do not evaluate to
+            # plain data (e.g. a function) fall back to hashing the files
+            # next to the input, which misses imports outside that
+            # directory; use --no-cache after editing those.
+            if INPUT_VALUE="$(nix-instantiate --eval --strict --json "$INPUT_NIX" 2>/dev/null)"; then
+              INPUT_KEY="value $(printf '%s' "$INPUT_VALUE" | sha256sum | cut -d' ' -f1)"
+            else
+              echo "[!] $INPUT_NIX does not evaluate to plain data; keying the cache on its directory" >&2
+              INPUT_DIR="$(cd "$(dirname "$INPUT_NIX")" && pwd)"
+              INPUT_KEY="dir $(basename "$INPUT_NIX") $(
+                cd "$INPUT_DIR" && find . -type f -not -path '*/.git/*' -print0 \
+                  | LC_ALL=C sort -z | xargs -0 -r sha256sum | sha256sum | cut -d' ' -f1
+              )"
+            fi
+            KEY="$(
+              {
+                echo "solver ${solverApp} ${network-solver.narHash}"
+                echo "input $INPUT_KEY"
+              } | sha256sum | cut -d' ' -f1
+            )"
+
+            CACHE_ROOT="''${XDG_CACHE_HOME:-$HOME/.cache}/network-renderer"
+            CACHE_DIR="$CACHE_ROOT/solver"
+            CACHED="$CACHE_DIR/$KEY.json"
+
+            if [ -s "$CACHED" ]; then
+              echo "[*] Reusing cached solver output $CACHED"
+              touch "$CACHED"
+            else
+              echo "[*] Running solver..."
+              mkdir -p "$CACHE_DIR"
+              TMP="$(mktemp "$CACHE_DIR/.$KEY.XXXXXX")"
+              trap 'rm -f "$TMP"' EXIT
+              ${solverApp} "$INPUT_NIX" > "$TMP"
+              mv -f "$TMP" "$CACHED"
+            fi
 
-            PYTHONPATH="$(pwd)" \
-              ${pythonEnv}/bin/python3 ${./generate-clab-config.py} \
-                "$OUTPUT_JSON" "$TOPO_OUT" "$BRIDGES_OUT"
+            echo "[*] Generating Containerlab topology..."
+            render "$CACHED" --snapshot-dir "$CACHE_ROOT/snapshots"
           '';
         };
     };
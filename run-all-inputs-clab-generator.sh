@@ -1,8 +1,14 @@
 #!/usr/bin/env bash
 set -euo pipefail
 
+# The app keeps solver output in its cache instead of the working directory.
+SOLVER_CACHE="${XDG_CACHE_HOME:-$HOME/.cache}/network-renderer/solver"
+MARK="$(mktemp)"
+trap 'rm -f "$MARK"' EXIT
+
 find ../network-compiler/examples -name inputs.nix -type f | while read -r file; do
   echo "[*] Running for $file"
+  touch "$MARK"
 
   if ! nix run .#generate-clab-config "$file"; then
     echo
@@ -16,6 +22,13 @@ find ../network-compiler/examples -name inputs.nix -type f | while read -r file;
     echo 
     
 
+    # Solver output used by this run (the app touches cache hits too).
+    for j in $(find "$SOLVER_CACHE" -maxdepth 1 -name '*.json' -newer "$MARK" 2>/dev/null); do
+      echo "===== solver output $j ====="
+      jq -c . "$j"
+      echo
+    done
+
     for j in ./*.json; do
       [ -e "$j" ] || continue
       echo "===== $j ====="
@@ -1,6 +1,7 @@
 #!/usr/bin/env bash
 
 docker-clab-frr-plus-tooling/build.sh
+docker-clab-client/build.sh
 
 containerlab deploy -t fabric.clab.yml -d --reconfigure
 
@@ -11,11 +11,38 @@ let
 
   bridges = generated.bridges;
 
+  vlanBridge = generated.vlanBridge or null;
+  vlanHostPorts = generated.vlanHostPorts or { };
+
   mkNetdev = name: {
     netdevConfig = {
       Name = name;
       Kind = "bridge";
     };
+    bridgeConfig = {
+      STP = false;
+      ForwardDelaySec = 0;
+      MulticastSnooping = false;
+    } // lib.optionalAttrs (name == vlanBridge) {
+      VLANFiltering = true;
+      DefaultPVID = "none";
+    };
+  };
+
+  mkHostPort = name: vid: {
+    matchConfig.Name = name;
+    networkConfig = {
+      Bridge = vlanBridge;
+      ConfigureWithoutCarrier = true;
+      LinkLocalAddressing = "no";
+    };
+    bridgeVLANs = [
+      {
+        VLAN = vid;
+        PVID = vid;
+        EgressUntagged = vid;
+      }
+    ];
   };
 
   mkNetwork = name: {
@@ -50,7 +77,9 @@ in
   boot.kernelModules = [ "br_netfilter" ];
 
   systemd.network.netdevs = lib.genAttrs bridges mkNetdev;
-  systemd.network.networks = lib.genAttrs bridges mkNetwork;
+  systemd.network.networks =
+    lib.genAttrs bridges mkNetwork
+    // lib.mapAttrs mkHostPort vlanHostPorts;
 
   virtualisation.docker.enable = true;
 